@@ -0,0 +1,87 @@
+import os
+import time
+import matplotlib
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from csv_loader import expand_paths, load_prices, path_digest
+from csv_data_visualizer import selected_charts, use_plotting
+
+# The frame of the CSV a worker rendered last; tasks are queued CSV by CSV, so it is usually reused
+_loaded = {}
+
+
+def use_headless_backend():
+	"""Worker initializer: Agg renders straight to image files, no display needed"""
+	matplotlib.use('Agg', force=True)
+	use_plotting()
+
+def chart_paths(output, csv, index, name, formats):
+	"""Deterministic image paths: <output>/<csv name>_<path hash>/<chart number>_<chart name>.<format>
+
+	The hash of the CSV's full path keeps same-named files in different directories apart.
+	"""
+	stem = os.path.splitext(os.path.basename(csv))[0]
+	folder = f"{stem}_{path_digest(csv)[:8]}"
+	return [os.path.join(output, folder, f"{index + 1}_{name}.{extension}") for extension in formats]
+
+def load_frame(csv, args):
+	if csv not in _loaded:
+		_loaded.clear()
+		_loaded[csv] = load_prices(csv, cache_dir=args.cache_dir, use_cache=not args.no_cache, quiet=True)
+	return _loaded[csv]
+
+def prepare_csv(csv, args):
+	"""Parse a CSV once up front so every chart task for it reads the cache"""
+	return len(load_prices(csv, cache_dir=args.cache_dir, quiet=True))
+
+def render_chart(csv, index, args):
+	"""Draw one chart of one CSV on its own figure and save it in each requested format"""
+	name, draw, size = selected_charts(args)[index]
+	df = load_frame(csv, args)
+	# A bare Figure is not tracked by pyplot, so it is freed as soon as the task returns
+	fig = Figure(figsize=size)
+	draw(fig.add_subplot(), df, args)
+	fig.tight_layout()
+	paths = chart_paths(args.output, csv, index, name, args.formats)
+	for path in paths:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		fig.savefig(path, dpi=args.dpi)
+	fig.clear()
+	return paths
+
+def render_batch(args):
+	"""Render every chart of every CSV to image files in a process pool and report throughput"""
+	# The same file named twice (a.csv, ./a.csv) would render into the same folder twice
+	seen = set()
+	csvs = [csv for csv in expand_paths(args.csvs)
+			if not (os.path.abspath(csv) in seen or seen.add(os.path.abspath(csv)))]
+	if not csvs:
+		return
+	started = time.perf_counter()
+	rows = 0
+	with ProcessPoolExecutor(max_workers=args.workers, initializer=use_headless_backend) as executor:
+		if not args.no_cache:
+			loads = {csv: executor.submit(prepare_csv, csv, args) for csv in csvs}
+			ready = []
+			for csv, future in loads.items():
+				try:
+					rows += future.result()
+					ready.append(csv)
+				except (OSError, ValueError) as e:
+					print(f"❌ Could not load {csv}: {e}")
+			csvs = ready
+
+		tasks = [(csv, index, executor.submit(render_chart, csv, index, args))
+				 for csv in csvs for index in range(len(selected_charts(args)))]
+		images = charts = 0
+		for csv, index, future in tasks:
+			try:
+				images += len(future.result())
+				charts += 1
+			except Exception as e:
+				print(f"❌ {csv}: chart {index + 1} ({selected_charts(args)[index][0]}) failed: {e}")
+
+	elapsed = time.perf_counter() - started
+	print(f"🖼️  Rendered {charts} charts ({images} files) from {len(csvs)} CSVs into {args.output}/ "
+		  f"in {elapsed:.1f}s: {charts / elapsed:.1f} charts/sec"
+		  + (f", {rows / elapsed:,.0f} rows/sec" if rows else ""))
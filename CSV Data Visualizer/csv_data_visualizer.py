@@ -1,43 +1,276 @@
+import argparse
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from large_data import lttb_indices, min_max_indices, density_grid, least_squares, binned_kde
+from csv_loader import CHUNK_ROWS, csv_columns, expand_paths, load_prices, summarize_csv
 
-# Set seaborn style for better-looking plots
-sns.set_style("whitegrid")  # Clean background with grid
-sns.set_palette("husl")     # Beautiful color palette
+# matplotlib and seaborn take over a second to import, so they are loaded only once a chart is drawn
+plt = sns = None
 
 
-def main():
-	df = pd.read_csv('bitcoin_prices.csv')
-	print("📊 Dataset loaded successfully!")
-	print(f"📋 Columns available: {list(df.columns)}")
-	print("\n🔍 First 5 rows:")
-	print(df.head())
-	
+def use_plotting():
+	"""Import pyplot and seaborn and apply the seaborn style; later calls do nothing"""
+	global plt, sns
+	if sns is not None:
+		return
+	import matplotlib.pyplot as plt
+	import seaborn as sns
+	# Set seaborn style for better-looking plots
+	sns.set_style("whitegrid")  # Clean background with grid
+	sns.set_palette("husl")     # Beautiful color palette
+
+def line_points(ax):
+	"""Points a line chart on ax can show: about two per horizontal pixel"""
+	return max(int(ax.bbox.width) * 2, 100)
+
+def downsample(df, x, y, points, method='lttb'):
+	"""Rows of df worth drawing as a line of `points` points; small frames come back unchanged"""
+	if method == 'off' or len(df) <= points:
+		return df
+	df = df.dropna(subset=[x, y])
+	xs = df[x].to_numpy()
+	if xs.dtype.kind == 'M':
+		xs = xs.astype('datetime64[ns]').astype('int64')
+	ys = df[y].to_numpy(dtype='float64')
+	if method == 'minmax':
+		indices = min_max_indices(ys, points // 2)
+	else:
+		indices = lttb_indices(xs, ys, points)
+	return df.iloc[indices]
+
+def draw_density(ax, x, y, cmap):
+	"""Draw a 2D histogram of the points as one image instead of one marker per row"""
+	from matplotlib.colors import LogNorm
+	counts, extent = density_grid(x, y)
+	image = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower', extent=extent, aspect='auto',
+					  cmap=cmap, norm=LogNorm(), interpolation='nearest')
+	ax.figure.colorbar(image, ax=ax, label='Rows per cell')
+	return image
+
+def draw_trend_line(ax, x, y, color):
+	"""Closed-form least-squares line, instead of regplot's bootstrapped confidence band"""
+	slope, intercept = least_squares(x, y)
+	ends = np.array([np.nanmin(x), np.nanmax(x)], dtype=np.float64)
+	ax.plot(ends, slope * ends + intercept, color=color, linewidth=2)
+
+# Derived frames kept per (source file version, analysis, parameters); oldest dropped first
+ANALYTICS_LIMIT = 16
+_analytics = {}
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'MS'}
+PERIOD_TITLES = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}
+
+def memoized(df, name, params, compute):
+	"""Reuse a derived frame computed from the same file with the same parameters"""
+	source = df.attrs.get('source')
+	if source is None:
+		return compute()
+	key = (source, name, params)
+	if key not in _analytics:
+		if len(_analytics) >= ANALYTICS_LIMIT:
+			_analytics.pop(next(iter(_analytics)))
+		_analytics[key] = compute()
+	return _analytics[key]
+
+def window_size(window):
+	"""'30' is a number of rows, '7D' or '12h' a time span"""
+	return int(window) if str(window).isdigit() else window
+
+def rolling_analytics(df, windows=('7', '30')):
+	"""Returns, log returns and, per window, the moving average and volatility of Price_USD"""
+	def compute():
+		frame = df if df['Date'].is_monotonic_increasing else df.sort_values('Date')
+		prices = frame.set_index('Date')['Price_USD'].astype('float64')
+		returns = prices.pct_change()
+		columns = {'Price_USD': prices, 'Return': returns, 'Log_Return': np.log(prices).diff()}
+		for window in windows:
+			columns[f'SMA_{window}'] = prices.rolling(window_size(window)).mean()
+			columns[f'Volatility_{window}'] = returns.rolling(window_size(window)).std()
+		return pd.DataFrame(columns).reset_index()
+	return memoized(df, 'rolling', tuple(windows), compute)
+
+def resample_ohlc(df, period='week'):
+	"""Open, high, low and close price plus total volume per calendar day, week or month"""
+	def compute():
+		frame = df.set_index('Date').sort_index()
+		resampler = frame['Price_USD'].astype('float64').resample(PERIODS[period])
+		ohlc = resampler.ohlc()
+		ohlc['volume'] = frame['Volume_24h'].resample(PERIODS[period]).sum()
+		return ohlc.dropna(subset=['open'])
+	return memoized(df, 'ohlc', period, compute)
+
+# Chart 1: Line Plot - Bitcoin Price Over Time
+def chart_price_line(ax, df, args):
+	line = downsample(df, 'Date', 'Price_USD', line_points(ax), args.downsample)
+	ax.plot(line['Date'], line['Price_USD'], linewidth=2, color='orange')
+	ax.set_title('Bitcoin Price Over Time', fontsize=14, fontweight='bold')
+	ax.set_xlabel('Date')
+	ax.set_ylabel('Price (USD)')
+	ax.tick_params(axis='x', rotation=45)
+	ax.grid(True, alpha=0.3)
+
+# Chart 2: Bar Chart - Trading Volume (first 10 days)
+def chart_volume_bars(ax, df, args):
+	ax.bar(df['Date'][:10], df['Volume_24h'][:10], color='skyblue', alpha=0.7)
+	ax.set_title('Trading Volume (First 10 Days)', fontsize=14, fontweight='bold')
+	ax.set_xlabel('Date')
+	ax.set_ylabel('Volume (24h)')
+	ax.tick_params(axis='x', rotation=45)
+
+# Chart 3: Scatter Plot - Price vs Volume Relationship
+def chart_price_volume(ax, df, args):
+	if len(df) > args.density_threshold:
+		draw_density(ax, df['Price_USD'].to_numpy(), df['Volume_24h'].to_numpy(), 'Greens')
+	else:
+		ax.scatter(df['Price_USD'], df['Volume_24h'], color='green', alpha=0.6)
+	ax.set_title('Price vs Volume Correlation', fontsize=14, fontweight='bold')
+	ax.set_xlabel('Price (USD)')
+	ax.set_ylabel('Volume (24h)')
+	ax.grid(True, alpha=0.3)
+
+# Chart 4: Seaborn Line Plot with confidence intervals
+def chart_seaborn_line(ax, df, args):
+	line = downsample(df, 'Date', 'Price_USD', line_points(ax), args.downsample)
+	sns.lineplot(data=line, x='Date', y='Price_USD', ax=ax, linewidth=3)
+	ax.set_title('Bitcoin Price Trend (Seaborn Style)', fontsize=14, fontweight='bold')
+	ax.tick_params(axis='x', rotation=45)
+
+# Chart 5: Seaborn Scatter Plot with regression line
+def chart_regression(ax, df, args):
+	if len(df) > args.density_threshold:
+		draw_density(ax, df['Price_USD'].to_numpy(), df['Volume_24h'].to_numpy(), 'viridis')
+		draw_trend_line(ax, df['Price_USD'].to_numpy(), df['Volume_24h'].to_numpy(), 'red')
+		ax.set_xlabel('Price_USD')
+		ax.set_ylabel('Volume_24h')
+	else:
+		sns.scatterplot(data=df, x='Price_USD', y='Volume_24h', ax=ax, s=80, alpha=0.7)
+		sns.regplot(data=df, x='Price_USD', y='Volume_24h', ax=ax, scatter=False, color='red')
+	ax.set_title('Price vs Volume with Trend Line', fontsize=14, fontweight='bold')
+
+# Chart 6: Distribution Plot - Daily Price Changes
+def chart_distribution(ax, df, args):
+	# Histogram and KDE are computed here in O(n); seaborn's own KDE is O(n * grid) and dominates on long histories
+	values = df['Daily_Change_Percent'].to_numpy(dtype=np.float64)
+	values = values[np.isfinite(values)]
+	counts, edges = np.histogram(values, bins=20)
+	sns.histplot(x=(edges[:-1] + edges[1:]) / 2, weights=counts, bins=len(counts),
+				 binrange=(edges[0], edges[-1]), alpha=0.5, ax=ax)  # histplot's bar alpha when it draws a KDE
+	kde = binned_kde(values)
+	if kde is not None:
+		grid, density = kde
+		# Scaled from density to counts per bin, in the bars' color, as histplot(kde=True) does
+		ax.plot(grid, density * len(values) * (edges[1] - edges[0]), color=ax.patches[0].get_facecolor()[:3])
+	ax.set_title('Distribution of Daily Price Changes', fontsize=16, fontweight='bold')
+	ax.set_xlabel('Daily Change (%)')
+	ax.set_ylabel('Frequency')
+	ax.axvline(x=0, color='red', linestyle='--', alpha=0.7, label='No Change Line')
+	ax.legend()
+
+# Chart 7: Moving Averages - price with its rolling means
+def chart_moving_averages(ax, df, args):
+	stats = rolling_analytics(df, args.windows)
+	points = line_points(ax)
+	line = downsample(stats, 'Date', 'Price_USD', points, args.downsample)
+	ax.plot(line['Date'], line['Price_USD'], linewidth=1, color='orange', alpha=0.6, label='Price')
+	for window in args.windows:
+		line = downsample(stats, 'Date', f'SMA_{window}', points, args.downsample)
+		ax.plot(line['Date'], line[f'SMA_{window}'], linewidth=2, label=f'{window} moving average')
+	ax.set_title('Price and Moving Averages', fontsize=14, fontweight='bold')
+	ax.set_xlabel('Date')
+	ax.set_ylabel('Price (USD)')
+	ax.tick_params(axis='x', rotation=45)
+	ax.legend()
+
+# Chart 8: Rolling Volatility - standard deviation of returns
+def chart_volatility(ax, df, args):
+	stats = rolling_analytics(df, args.windows)
+	for window in args.windows:
+		line = downsample(stats, 'Date', f'Volatility_{window}', line_points(ax), args.downsample)
+		ax.plot(line['Date'], line[f'Volatility_{window}'] * 100, linewidth=2, label=f'{window} window')
+	ax.set_title('Rolling Volatility of Returns', fontsize=14, fontweight='bold')
+	ax.set_xlabel('Date')
+	ax.set_ylabel('Std. dev. of returns (%)')
+	ax.tick_params(axis='x', rotation=45)
+	ax.legend()
+
+# Chart 9: OHLC Candles per calendar period
+def chart_ohlc(ax, df, args):
+	ohlc = resample_ohlc(df, args.period)
+	rising = ohlc['close'] >= ohlc['open']
+	colors = np.where(rising, 'green', 'red')
+	# Candles sit mid-period: days and months are labelled by their start, weeks by their Sunday
+	middle, width = {'day': (0.5, 0.6), 'week': (-3, 5), 'month': (15, 22)}[args.period]
+	centers = ohlc.index + pd.Timedelta(days=middle)
+	ax.vlines(centers, ohlc['low'], ohlc['high'], color=colors, linewidth=1)
+	ax.bar(centers, (ohlc['close'] - ohlc['open']).abs(), bottom=ohlc[['open', 'close']].min(axis=1),
+		   width=width, color=colors, alpha=0.8)
+	ax.set_title(f"{PERIOD_TITLES[args.period]} Open/High/Low/Close", fontsize=14, fontweight='bold')
+	ax.set_xlabel('Date')
+	ax.set_ylabel('Price (USD)')
+	ax.tick_params(axis='x', rotation=45)
+
+# (file name, drawing function, figure size when drawn on its own)
+CHARTS = [
+	('price_line', chart_price_line, (8, 6)),
+	('volume_bars', chart_volume_bars, (8, 6)),
+	('price_volume', chart_price_volume, (8, 6)),
+	('seaborn_line', chart_seaborn_line, (8, 6)),
+	('regression', chart_regression, (8, 6)),
+	('distribution', chart_distribution, (10, 6)),
+]
+ANALYTICS_CHARTS = [
+	('moving_averages', chart_moving_averages, (10, 6)),
+	('volatility', chart_volatility, (10, 6)),
+	('ohlc', chart_ohlc, (10, 6)),
+]
+
+def selected_charts(args):
+	"""The charts to draw: the six standard ones, plus the analytics charts when asked for"""
+	return CHARTS + (ANALYTICS_CHARTS if args.analytics else [])
+
+
+def parse_arguments():
+	parser = argparse.ArgumentParser(description='Visualize a CSV of daily prices')
+	parser.add_argument('csvs', nargs='*', metavar='csv', default=['bitcoin_prices.csv'],
+						help='CSV files or glob patterns to plot (default: bitcoin_prices.csv)')
+	parser.add_argument('--summary', action='store_true',
+						help='Only print row count and per-column min/max/mean/nulls, streamed without plotting')
+	parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+						help=f'Rows read at a time by --summary (default: {CHUNK_ROWS:,})')
+	parser.add_argument('--downsample', default='lttb', choices=('lttb', 'minmax', 'off'),
+						help='How line charts thin out series longer than the chart is wide (default: lttb)')
+	parser.add_argument('--density-threshold', type=int, default=50000,
+						help='Above this many rows, scatter charts become 2D histograms (default: 50000)')
+	parser.add_argument('--analytics', action='store_true',
+						help='Add moving average, volatility and OHLC charts')
+	parser.add_argument('--windows', nargs='+', default=['7', '30'],
+						help="Rolling windows: row counts like 30 or time spans like 7D (default: 7 30)")
+	parser.add_argument('--period', default='week', choices=sorted(PERIODS),
+						help='Calendar period of the OHLC chart (default: week)')
+	parser.add_argument('--cache-dir', help='Where parsed CSVs are cached (default: .visualizer_cache next to the CSV)')
+	parser.add_argument('--no-cache', action='store_true', help='Always parse the CSV, without reading or writing the cache')
+	parser.add_argument('--batch', action='store_true',
+						help='Render every chart of every CSV to image files without opening windows')
+	parser.add_argument('--output', default='charts', help='Directory for --batch images (default: charts)')
+	parser.add_argument('--formats', nargs='+', default=['png'], choices=('png', 'svg', 'pdf'),
+						help='Image formats written by --batch (default: png)')
+	parser.add_argument('--dpi', type=int, default=100, help='Resolution of --batch PNGs (default: 100)')
+	parser.add_argument('--workers', type=int, help='Processes for --batch (default: CPU count)')
+	parser.add_argument('--live', action='store_true',
+						help='Follow rows appended to the CSV, redrawing only the changed artists')
+	parser.add_argument('--fps', type=float, default=4, help='Most --live redraws per second (default: 4)')
+	args = parser.parse_args()
+	if args.fps <= 0:
+		parser.error('--fps must be greater than 0')
+	return args
+
+def show_charts(df, args):
+	"""The interactive view: three windows holding the six charts"""
+	use_plotting()
 	# Create 3 charts in one window
 	fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(18, 6))  # 1 row, 3 columns
-	
-	# Chart 1: Line Plot - Bitcoin Price Over Time
-	ax1.plot(df['Date'], df['Price_USD'], linewidth=2, color='orange')
-	ax1.set_title('Bitcoin Price Over Time', fontsize=14, fontweight='bold')
-	ax1.set_xlabel('Date')
-	ax1.set_ylabel('Price (USD)')
-	ax1.tick_params(axis='x', rotation=45)
-	ax1.grid(True, alpha=0.3)
-	
-	# Chart 2: Bar Chart - Trading Volume (first 10 days)
-	ax2.bar(df['Date'][:10], df['Volume_24h'][:10], color='skyblue', alpha=0.7)
-	ax2.set_title('Trading Volume (First 10 Days)', fontsize=14, fontweight='bold')
-	ax2.set_xlabel('Date')
-	ax2.set_ylabel('Volume (24h)')
-	ax2.tick_params(axis='x', rotation=45)
-	
-	# Chart 3: Scatter Plot - Price vs Volume Relationship
-	ax3.scatter(df['Price_USD'], df['Volume_24h'], color='green', alpha=0.6)
-	ax3.set_title('Price vs Volume Correlation', fontsize=14, fontweight='bold')
-	ax3.set_xlabel('Price (USD)')
-	ax3.set_ylabel('Volume (24h)')
-	ax3.grid(True, alpha=0.3)
+	chart_price_line(ax1, df, args)
+	chart_volume_bars(ax2, df, args)
+	chart_price_volume(ax3, df, args)
 	
 	# Adjust layout to prevent overlap
 	plt.tight_layout()
@@ -53,35 +286,73 @@ def main():
 	
 	# Create 2 more advanced charts using Seaborn
 	fig2, (ax4, ax5) = plt.subplots(1, 2, figsize=(15, 6))
-	
-	# Chart 4: Seaborn Line Plot with confidence intervals
-	sns.lineplot(data=df, x='Date', y='Price_USD', ax=ax4, linewidth=3)
-	ax4.set_title('Bitcoin Price Trend (Seaborn Style)', fontsize=14, fontweight='bold')
-	ax4.tick_params(axis='x', rotation=45)
-	
-	# Chart 5: Seaborn Scatter Plot with regression line
-	sns.scatterplot(data=df, x='Price_USD', y='Volume_24h', ax=ax5, s=80, alpha=0.7)
-	sns.regplot(data=df, x='Price_USD', y='Volume_24h', ax=ax5, scatter=False, color='red')
-	ax5.set_title('Price vs Volume with Trend Line', fontsize=14, fontweight='bold')
+	chart_seaborn_line(ax4, df, args)
+	chart_regression(ax5, df, args)
 	
 	plt.tight_layout()
 	plt.show()
 	
-	# Chart 6: Distribution Plot - Daily Price Changes
-	plt.figure(figsize=(10, 6))
-	sns.histplot(data=df, x='Daily_Change_Percent', bins=20, kde=True)
-	plt.title('Distribution of Daily Price Changes', fontsize=16, fontweight='bold')
-	plt.xlabel('Daily Change (%)')
-	plt.ylabel('Frequency')
-	plt.axvline(x=0, color='red', linestyle='--', alpha=0.7, label='No Change Line')
-	plt.legend()
+	fig3, ax6 = plt.subplots(figsize=(10, 6))
+	chart_distribution(ax6, df, args)
 	plt.show()
 	
 	print("\n🎨 Seaborn charts displayed:")
 	print("  4. Enhanced Line Plot: Cleaner seaborn styling")
 	print("  5. Regression Plot: Scatter + trend line showing correlation") 
 	print("  6. Distribution Plot: Histogram + density curve of price changes")
+	
+	if args.analytics:
+		# Charts 7 and 8 share one memoized rolling computation
+		fig4, (ax7, ax8, ax9) = plt.subplots(1, 3, figsize=(18, 6))
+		chart_moving_averages(ax7, df, args)
+		chart_volatility(ax8, df, args)
+		chart_ohlc(ax9, df, args)
+		plt.tight_layout()
+		plt.show()
+		
+		print("\n📐 Analytics charts displayed:")
+		print(f"  7. Moving Averages: {', '.join(args.windows)} window means over the price")
+		print("  8. Volatility: Rolling standard deviation of returns")
+		print(f"  9. OHLC: Open/high/low/close candles per {args.period}")
+
+def print_summary(csv, args):
+	"""Per-column statistics streamed over the CSV; nothing is plotted"""
+	rows, summary = summarize_csv(csv, args.chunk_rows)
+	print(f"\n📋 {csv}: {rows:,} rows, {len(summary)} columns")
+	print(summary.to_string(float_format='{:.7g}'.format, na_rep='-'))
+
+def main():
+	args = parse_arguments()
+	if args.summary:
+		for csv in expand_paths(args.csvs):
+			try:
+				print_summary(csv, args)
+			except (OSError, ValueError) as e:
+				print(f"❌ Could not summarize {csv}: {e}")
+		return
+	if args.batch:
+		# Deferred so interactive runs never pay for the process pool machinery
+		from batch_render import render_batch
+		render_batch(args)
+		return
+	if args.live:
+		use_plotting()
+		from live_view import run_live
+		run_live(args)
+		return
+
+	for csv in expand_paths(args.csvs):
+		try:
+			df = load_prices(csv, cache_dir=args.cache_dir, use_cache=not args.no_cache)
+		except (OSError, ValueError) as e:
+			print(f"❌ Could not load {csv}: {e}")
+			continue
+		print("📊 Dataset loaded successfully!")
+		print(f"📋 Columns available: {csv_columns(csv)}")
+		print("\n🔍 First 5 rows:")
+		print(df.head().to_string(float_format='{:.7g}'.format))  # float32 columns carry about 7 digits
+		show_charts(df, args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
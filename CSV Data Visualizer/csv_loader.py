@@ -0,0 +1,198 @@
+import os
+import glob
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+CHUNK_ROWS = 1_000_000
+# Rows parsed at a time when loading; parsing a chunk's dates needs more room than its typed columns
+LOAD_CHUNK_ROWS = 250_000
+
+# Explicit types for the columns the charts use; float32 halves memory and is plenty for plotting.
+# Volumes stay float64: float32's 7 significant digits would shift an 11-digit volume by thousands.
+SCHEMA = {
+	'Date': 'datetime',
+	'Price_USD': 'float32',
+	'Volume_24h': 'float64',
+	'Market_Cap_Billion': 'float32',
+	'Daily_Change_Percent': 'float32',
+}
+CHART_COLUMNS = ['Date', 'Price_USD', 'Volume_24h', 'Daily_Change_Percent']
+
+
+def expand_paths(patterns):
+	"""Expand glob patterns (for shells that do not), keeping the given order"""
+	paths = []
+	for pattern in patterns:
+		matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+		if not matches:
+			print(f"⚠️  No files match {pattern}")
+		paths.extend(matches)
+	return paths
+
+def csv_columns(path):
+	"""Column names from the header row only"""
+	return list(pd.read_csv(path, nrows=0).columns)
+
+def downcast(frame):
+	"""Shrink columns the schema does not know: floats to float32, text to categoricals"""
+	for column in frame.columns:
+		if column in SCHEMA:
+			continue
+		if frame[column].dtype.kind == 'f':
+			frame[column] = frame[column].astype('float32')
+		elif frame[column].dtype.kind == 'i':
+			frame[column] = pd.to_numeric(frame[column], downcast='integer')
+		elif frame[column].dtype.kind == 'O' or pd.api.types.is_string_dtype(frame[column]):
+			frame[column] = frame[column].astype('category')
+	return frame
+
+def column_types(columns):
+	"""read_csv's dtype and parse_dates arguments for `columns`, from SCHEMA"""
+	dtypes = {column: SCHEMA[column] for column in columns if SCHEMA.get(column) not in (None, 'datetime')}
+	dates = [column for column in columns if SCHEMA.get(column) == 'datetime']
+	return dtypes, dates
+
+def read_typed_csv(path, columns, chunk_rows=LOAD_CHUNK_ROWS):
+	"""Read only `columns`, typed as they are parsed, a chunk at a time.
+
+	Parsing a chunk needs room for its text, and dates are converted from
+	strings, so a chunk at a time keeps that overhead to one chunk. The chunks
+	are then joined column by column, each column's pieces freed as soon as it
+	is joined, so the peak is the typed frame plus one column or one chunk,
+	not two copies of the frame.
+	"""
+	header = csv_columns(path)
+	missing = [column for column in columns if column not in header]
+	if missing:
+		raise ValueError(f"{path} has no column(s) {', '.join(missing)}")
+	dtypes, dates = column_types(columns)
+
+	pieces = {column: [] for column in columns}
+	for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, parse_dates=dates, chunksize=chunk_rows):
+		for column in columns:
+			# A copy owns its memory; a view would keep the chunk's shared block of columns alive
+			pieces[column].append(chunk[column].copy())
+	if not pieces[columns[0]]:
+		return downcast(pd.DataFrame(columns=columns))
+	joined = {}
+	for column in columns:
+		joined[column] = pd.concat(pieces.pop(column), ignore_index=True)
+	# Text columns become categoricals only after joining, so every chunk shares the categories
+	return downcast(pd.DataFrame(joined, copy=False))
+
+def summarize_csv(path, chunk_rows=CHUNK_ROWS):
+	"""Row count and per-column type, non-null and null counts, min, max and mean, a chunk at a time.
+
+	Only one chunk is in memory at once, so any file size works. Columns in
+	SCHEMA are parsed with their schema type; other columns are inferred per
+	chunk, and a column that is not numeric (or a date) in any chunk is
+	reported as text, with counts only.
+	"""
+	header = csv_columns(path)
+	dtypes, dates = column_types([column for column in header if column in SCHEMA])
+	stats = {column: {'type': None, 'non_null': 0, 'nulls': 0, 'min': None, 'max': None, 'sum': 0.0}
+			 for column in header}
+	rows = 0
+	for chunk in pd.read_csv(path, dtype=dtypes, parse_dates=dates, chunksize=chunk_rows):
+		rows += len(chunk)
+		for column, entry in stats.items():
+			values = chunk[column]
+			present = int(values.notna().sum())
+			entry['non_null'] += present
+			entry['nulls'] += len(values) - present
+			if not present:
+				continue  # an all-empty chunk says nothing about the column's type
+			if pd.api.types.is_datetime64_any_dtype(values):
+				kind = 'datetime'
+			elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+				kind = 'numeric'
+			else:
+				kind = 'text'
+			if entry['type'] not in (None, kind):
+				kind = 'text'
+			entry['type'] = kind
+			if kind == 'text':
+				continue
+			low, high = values.min(), values.max()
+			entry['min'] = low if entry['min'] is None else min(entry['min'], low)
+			entry['max'] = high if entry['max'] is None else max(entry['max'], high)
+			if kind == 'numeric':
+				entry['sum'] += float(np.nansum(values.to_numpy(dtype=np.float64, na_value=np.nan)))
+
+	summary = pd.DataFrame.from_dict(stats, orient='index')
+	summary['mean'] = np.where(summary['type'] == 'numeric', summary['sum'] / summary['non_null'].clip(lower=1), np.nan)
+	summary.loc[summary['type'] == 'text', ['min', 'max']] = np.nan
+	return rows, summary.drop(columns='sum')
+
+def path_digest(path):
+	"""Short hash of a file's absolute path, to tell apart files with the same name"""
+	return hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+
+def cache_path(path, cache_dir=None):
+	"""Where the cached frame for a CSV lives; the name includes a hash of the full path"""
+	path = os.path.abspath(path)
+	cache_dir = cache_dir or os.path.join(os.path.dirname(path), '.visualizer_cache')
+	return os.path.join(cache_dir, f"{os.path.basename(path)}.{path_digest(path)}.npz")
+
+def source_key(path, columns):
+	"""What a cache must match: the file's size and mtime plus the columns and schema it was read with"""
+	status = os.stat(path)
+	return {'version': CACHE_VERSION, 'size': status.st_size, 'mtime_ns': status.st_mtime_ns,
+			'columns': list(columns), 'schema': SCHEMA}
+
+def save_cache(frame, filename, key):
+	"""Write each column as its own array in an uncompressed .npz, atomically"""
+	arrays = {}
+	for column in frame.columns:
+		values = frame[column]
+		if isinstance(values.dtype, pd.CategoricalDtype):
+			arrays[f"{column}.codes"] = values.cat.codes.to_numpy()
+			arrays[f"{column}.categories"] = np.array(values.cat.categories.astype(str), dtype=str)
+		else:
+			arrays[column] = values.to_numpy()
+	meta = dict(key, columns=list(frame.columns))
+	os.makedirs(os.path.dirname(filename), exist_ok=True)
+	temporary = filename + '.tmp.npz'
+	np.savez(temporary, __meta__=np.array(json.dumps(meta)), **arrays)
+	os.replace(temporary, filename)
+
+def load_cache(filename, key):
+	"""The cached frame, or None if there is none or it was made from a different file or schema"""
+	try:
+		with np.load(filename, allow_pickle=False) as data:
+			meta = json.loads(str(data['__meta__']))
+			if {name: meta.get(name) for name in key} != key:
+				return None
+			columns = {}
+			for column in meta['columns']:
+				if f"{column}.codes" in data:
+					columns[column] = pd.Categorical.from_codes(data[f"{column}.codes"], data[f"{column}.categories"])
+				else:
+					columns[column] = data[column]
+	except (OSError, ValueError, KeyError):
+		return None
+	return pd.DataFrame(columns)
+
+def load_prices(path, columns=CHART_COLUMNS, cache_dir=None, use_cache=True, chunk_rows=LOAD_CHUNK_ROWS, quiet=False):
+	"""Load the chart columns of a CSV, from the binary cache when the CSV has not changed"""
+	# attrs['source'] identifies the file version, so derived results can be memoized per file
+	key = source_key(path, columns)
+	filename = cache_path(path, cache_dir)
+	if use_cache:
+		frame = load_cache(filename, key)
+		if frame is not None:
+			frame.attrs['source'] = (os.path.abspath(path), key['size'], key['mtime_ns'])
+			if not quiet:
+				print(f"⚡ Loaded {len(frame):,} rows from cache {filename}")
+			return frame
+	frame = read_typed_csv(path, columns, chunk_rows)
+	frame.attrs['source'] = (os.path.abspath(path), key['size'], key['mtime_ns'])
+	if use_cache:
+		try:
+			save_cache(frame, filename, key)
+		except OSError as e:
+			print(f"⚠️  Could not write cache {filename}: {e}")
+	return frame
@@ -0,0 +1,171 @@
+import time
+import argparse
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+	"""Row indices picked by Largest-Triangle-Three-Buckets, first and last row included"""
+	n = len(x)
+	if threshold >= n or threshold < 3:
+		return np.arange(n)
+	x = np.asarray(x, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+
+	# threshold - 2 buckets over the rows between the fixed first and last points
+	edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+	counts = np.diff(edges)
+	mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+	mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+	# The point after the last bucket is the last row itself
+	mean_x = np.append(mean_x[1:], x[-1])
+	mean_y = np.append(mean_y[1:], y[-1])
+
+	selected = np.empty(threshold, dtype=np.int64)
+	selected[0], selected[-1] = 0, n - 1
+	previous = 0
+	for bucket in range(threshold - 2):
+		start, end = edges[bucket], edges[bucket + 1]
+		# Twice the area of the triangle (previous pick, candidate, next bucket's mean)
+		area = np.abs((x[previous] - mean_x[bucket]) * (y[start:end] - y[previous])
+					  - (x[previous] - x[start:end]) * (mean_y[bucket] - y[previous]))
+		previous = start + int(np.argmax(area))
+		selected[bucket + 1] = previous
+	return selected
+
+def min_max_indices(y, buckets):
+	"""Row indices of the minimum and maximum of each of `buckets` equal runs of rows, in order"""
+	n = len(y)
+	if buckets * 2 >= n or buckets < 1:
+		return np.arange(n)
+	size = -(-n // buckets)
+	buckets = -(-n // size)
+	padded = np.full(buckets * size, np.nan)
+	padded[:n] = y
+	blocks = padded.reshape(buckets, size)
+	missing = np.isnan(blocks)
+	offsets = np.arange(buckets) * size
+	lowest = np.argmin(np.where(missing, np.inf, blocks), axis=1) + offsets
+	highest = np.argmax(np.where(missing, -np.inf, blocks), axis=1) + offsets
+	indices = np.concatenate(([0, n - 1], lowest, highest))
+	return np.unique(np.minimum(indices, n - 1))
+
+def density_grid(x, y, bins=200):
+	"""Count rows per cell of a bins x bins grid; returns the counts (y rows, x columns) and the grid's extent"""
+	x = np.asarray(x, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	finite = np.isfinite(x) & np.isfinite(y)
+	if not finite.all():
+		x, y = x[finite], y[finite]
+	if not len(x):
+		return np.zeros((bins, bins), dtype=np.int64), (0.0, 1.0, 0.0, 1.0)
+
+	extent = []
+	cells = []
+	for values in (x, y):
+		low, high = float(values.min()), float(values.max())
+		if high <= low:
+			low, high = low - 0.5, high + 0.5
+		cell = ((values - low) * (bins / (high - low))).astype(np.int64)
+		np.minimum(cell, bins - 1, out=cell)  # The maximum lands on the upper edge
+		extent += [low, high]
+		cells.append(cell)
+	# One flat bincount is several times faster than np.histogram2d
+	counts = np.bincount(cells[1] * bins + cells[0], minlength=bins * bins).reshape(bins, bins)
+	return counts, tuple(extent)
+
+def least_squares(x, y):
+	"""Slope and intercept of the ordinary least-squares line through the finite points"""
+	x = np.asarray(x, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	finite = np.isfinite(x) & np.isfinite(y)
+	x, y = x[finite], y[finite]
+	if len(x) < 2:
+		return float('nan'), float('nan')
+	# Centering first keeps the sums small enough to stay accurate over millions of rows
+	x_mean, y_mean = x.mean(), y.mean()
+	dx = x - x_mean
+	spread = dx @ dx
+	slope = (dx @ (y - y_mean)) / spread if spread else 0.0
+	return float(slope), float(y_mean - slope * x_mean)
+
+def binned_kde(values, grid_size=200, cut=0):
+	"""Gaussian KDE with Scott's bandwidth on grid_size points, as seaborn's histplot(kde=True) draws it.
+
+	Instead of evaluating every sample at every grid point (O(n * grid)), the
+	samples are linearly binned onto a fine grid of about 20 points per
+	bandwidth and convolved with the sampled kernel by FFT. Returns (grid,
+	density), or None when there are too few distinct values for a bandwidth.
+	"""
+	x = np.asarray(values, dtype=np.float64)
+	x = x[np.isfinite(x)]
+	n = len(x)
+	if n < 2:
+		return None
+	bandwidth = n ** -0.2 * x.std(ddof=1)  # Scott's rule, as in scipy's gaussian_kde
+	if not bandwidth > 0:
+		return None
+	low, high = float(x.min()), float(x.max())
+	grid = np.linspace(low - cut * bandwidth, high + cut * bandwidth, grid_size)
+
+	start, stop = min(grid[0], low), max(grid[-1], high)
+	points = int(min(max(np.ceil((stop - start) / bandwidth * 20), 1024), 1 << 20)) + 1
+	step = (stop - start) / (points - 1)
+	position = (x - start) / step
+	index = np.minimum(position.astype(np.int64), points - 2)
+	fraction = position - index
+	counts = (np.bincount(index, 1 - fraction, minlength=points)
+			  + np.bincount(index + 1, fraction, minlength=points))
+
+	reach = int(min(np.ceil(5 * bandwidth / step), points))  # The kernel is negligible past 5 bandwidths
+	kernel = np.exp(-0.5 * (np.arange(-reach, reach + 1) * step / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+	# Zero-padded to a power of two so the circular FFT convolution equals the linear one
+	size = 1 << int(np.ceil(np.log2(points + 2 * reach + 1)))
+	smoothed = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)[reach:reach + points] / n
+	return grid, np.interp(grid, start + np.arange(points) * step, smoothed)
+
+
+def benchmark_kde(sizes, repeat=1):
+	"""Time seaborn's histplot(kde=True) against the precomputed histogram and binned KDE"""
+	import matplotlib
+	matplotlib.use('Agg')
+	from matplotlib.figure import Figure
+	import seaborn as sns
+
+	rng = np.random.default_rng(0)
+	print(f"\n⏱️  KDE BENCHMARK (best of {repeat}):")
+	for size in sizes:
+		# A two-humped mixture, like daily changes in a trending market
+		values = np.concatenate([rng.normal(-1.2, 0.8, size // 3), rng.normal(2.5, 1.1, size - size // 3)])
+		timings = {}
+		curves = {}
+		for name in ('seaborn', 'binned'):
+			best = None
+			for _ in range(repeat):
+				ax = Figure().add_subplot()
+				started = time.perf_counter()
+				if name == 'seaborn':
+					sns.histplot(x=values, bins=20, kde=True, ax=ax)
+				else:
+					counts, edges = np.histogram(values, bins=20)
+					grid, density = binned_kde(values)
+					sns.histplot(x=(edges[:-1] + edges[1:]) / 2, weights=counts, bins=len(counts),
+								 binrange=(edges[0], edges[-1]), alpha=0.5, ax=ax)
+					ax.plot(grid, density * size * (edges[1] - edges[0]))
+				elapsed = time.perf_counter() - started
+				best = elapsed if best is None else min(best, elapsed)
+			timings[name] = best
+			curves[name] = ax.lines[-1].get_ydata()
+		error = np.abs(curves['seaborn'] - curves['binned']).max() / curves['seaborn'].max()
+		print(f"{size:>12,} samples: seaborn {timings['seaborn']:7.2f}s, binned {timings['binned']:6.3f}s "
+			  f"({timings['seaborn'] / timings['binned']:,.0f}x), max curve difference {error:.1e} of the peak")
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark the binned KDE against seaborn's histplot(kde=True)")
+	parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 10_000_000], help='Sample counts to time')
+	parser.add_argument('--repeat', type=int, default=1, help='Timing repetitions per size')
+	args = parser.parse_args()
+	benchmark_kde(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+	main()
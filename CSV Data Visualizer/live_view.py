@@ -0,0 +1,236 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from csv_loader import csv_columns, column_types, expand_paths
+
+LIVE_COLUMNS = ['Date', 'Price_USD', 'Daily_Change_Percent']
+CHUNK_BYTES = 32 * 1024 * 1024  # read per tick, so a large backlog loads over several frames
+HEADROOM = 0.25  # extra room added when an axis grows, so growth rarely forces a full redraw
+
+
+class CsvTail:
+	"""The rows appended to a CSV since the last read; an unfinished last line waits for the next read"""
+
+	def __init__(self, path, columns=LIVE_COLUMNS, chunk_bytes=CHUNK_BYTES):
+		self.path = path
+		self.columns = columns
+		self.chunk_bytes = chunk_bytes
+		self.dtypes, self.dates = column_types(columns)
+		self.header = None
+		self.offset = 0
+
+	def read_new(self):
+		"""(new rows or None, True if the file shrank and is being read again from the start)"""
+		restarted = False
+		with open(self.path, 'rb') as file:
+			size = os.fstat(file.fileno()).st_size
+			if self.header is not None and size < self.offset:
+				restarted = True
+				self.header = None
+			if self.header is None:
+				first = file.readline()
+				if not first.endswith(b'\n'):
+					return None, restarted
+				self.header = csv_columns(io.BytesIO(first))
+				self.offset = len(first)
+			file.seek(self.offset)
+			data = file.read(self.chunk_bytes)
+		end = data.rfind(b'\n') + 1
+		if not end:
+			return None, restarted
+		self.offset += end
+		rows = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.header, usecols=self.columns,
+						   dtype=self.dtypes, parse_dates=self.dates)
+		return rows[self.columns], restarted
+
+class GrowingArray:
+	"""Append-only float64 array; capacity doubles, so appending is amortized O(1) per value"""
+
+	def __init__(self, capacity=1024):
+		self.data = np.empty(capacity)
+		self.size = 0
+
+	def extend(self, values):
+		needed = self.size + len(values)
+		if needed > len(self.data):
+			grown = np.empty(max(needed, 2 * len(self.data)))
+			grown[:self.size] = self.data[:self.size]
+			self.data = grown
+		self.data[self.size:needed] = values
+		self.size = needed
+
+	@property
+	def values(self):
+		return self.data[:self.size]
+
+class ColumnExtremes:
+	"""Minimum and maximum y per pixel column of a fixed x range, updated with only the new points.
+
+	Drawing the two extremes of every column looks the same as drawing every
+	point, and the line never has more than two vertices per pixel however
+	long the series gets.
+	"""
+
+	def __init__(self, left, right, columns):
+		self.left = left
+		self.step = (right - left) / columns
+		self.low = np.full(columns, np.inf)
+		self.high = np.full(columns, -np.inf)
+
+	def add(self, x, y):
+		index = np.clip(((x - self.left) / self.step).astype(np.intp), 0, len(self.low) - 1)
+		np.minimum.at(self.low, index, y)
+		np.maximum.at(self.high, index, y)
+
+	def vertices(self):
+		filled = np.flatnonzero(self.high >= self.low)
+		centers = self.left + (filled + 0.5) * self.step
+		return np.repeat(centers, 2), np.column_stack([self.low[filled], self.high[filled]]).ravel()
+
+def grown_limits(limits, values):
+	"""Limits that fit values, with headroom on each side they overflow; None if limits already fit"""
+	smallest, largest = values.min(), values.max()
+	if limits is None:
+		low, high = smallest, largest
+	elif limits[0] <= smallest and largest <= limits[1]:
+		return None
+	else:
+		low, high = min(limits[0], smallest), max(limits[1], largest)
+	margin = (high - low) * HEADROOM or 1
+	return (low - margin if limits is None or smallest < limits[0] else low,
+			high + margin if limits is None or largest > limits[1] else high)
+
+
+class LiveView:
+	"""Price line and change histogram that grow as rows are appended to a CSV.
+
+	Only the line and the bars are animated: after each full draw the static
+	background is saved, and a tick restores it, draws those artists and blits.
+	A full draw happens only when an axis has to grow or the bins change.
+	"""
+
+	def __init__(self, path, bins=30, chunk_bytes=CHUNK_BYTES):
+		self.tail = CsvTail(path, chunk_bytes=chunk_bytes)
+		self.bins = bins
+		self.fig, (self.ax_line, self.ax_hist) = plt.subplots(1, 2, figsize=(15, 6))
+		self.line, = self.ax_line.plot([], [], linewidth=2, color='orange', animated=True)
+		self.bars = []
+		self.ax_line.xaxis_date()
+		self.ax_line.set_title(f"Live Price: {os.path.basename(path)}", fontsize=14, fontweight='bold')
+		self.ax_line.set_xlabel('Date')
+		self.ax_line.set_ylabel('Price (USD)')
+		self.ax_line.tick_params(axis='x', rotation=45)
+		self.ax_hist.set_title('Daily Price Changes', fontsize=14, fontweight='bold')
+		self.ax_hist.set_xlabel('Daily Change (%)')
+		self.ax_hist.set_ylabel('Frequency')
+		self.reset()
+		self.background = None
+		self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+	def reset(self):
+		self.dates, self.prices, self.changes = GrowingArray(), GrowingArray(), GrowingArray()
+		self.rows = 0
+		self.extremes = None
+		self.edges = self.counts = None
+
+	def on_draw(self, event):
+		"""After a full draw, keep the static background and put the animated artists on it"""
+		self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+		self.draw_artists()
+
+	def draw_artists(self):
+		self.ax_line.draw_artist(self.line)
+		for bar in self.bars:
+			self.ax_hist.draw_artist(bar)
+
+	def update(self):
+		"""Read the appended rows and redraw (returns nothing: a timer drops callbacks that return 0)"""
+		rows, restarted = self.tail.read_new()
+		if restarted:
+			self.reset()
+		if rows is None or rows.empty:
+			return
+		points = rows.dropna(subset=['Date', 'Price_USD'])
+		dates = mdates.date2num(points['Date'].to_numpy())
+		prices = points['Price_USD'].to_numpy(dtype=np.float64)
+		changes = rows['Daily_Change_Percent'].dropna().to_numpy(dtype=np.float64)
+		self.dates.extend(dates)
+		self.prices.extend(prices)
+		self.changes.extend(changes)
+
+		self.rows += len(rows)
+		full_draw = self.update_line(dates, prices) | self.update_histogram(changes) or restarted
+		canvas = self.fig.canvas
+		if full_draw or self.background is None:
+			# Tight layout is redone on every full draw, as the tick labels change with the data
+			self.fig.tight_layout()
+			canvas.draw()
+		else:
+			canvas.restore_region(self.background)
+			self.draw_artists()
+			canvas.blit(self.fig.bbox)
+		canvas.flush_events()
+
+	def update_line(self, dates, prices):
+		"""Fold the new points into the per-pixel extremes; True if the axes had to grow"""
+		if not len(dates):
+			return False
+		x_limits = grown_limits(self.ax_line.get_xlim() if self.extremes else None, dates)
+		y_limits = grown_limits(self.ax_line.get_ylim() if self.extremes else None, prices)
+		if y_limits:
+			self.ax_line.set_ylim(y_limits)
+		if x_limits:
+			self.ax_line.set_xlim(x_limits)
+			# The pixel columns moved, so rebuild them from the full series (rare, thanks to the headroom)
+			self.extremes = ColumnExtremes(*x_limits, max(int(self.ax_line.bbox.width), 100))
+			self.extremes.add(self.dates.values, self.prices.values)
+		else:
+			self.extremes.add(dates, prices)
+		self.line.set_data(*self.extremes.vertices())
+		return bool(x_limits or y_limits)
+
+	def update_histogram(self, changes):
+		"""Add the new changes to the bar counts; True if the bins or the y axis changed"""
+		if not len(changes):
+			return False
+		if self.edges is None or changes.min() < self.edges[0] or changes.max() > self.edges[-1]:
+			values = self.changes.values
+			low, high = values.min(), values.max()
+			margin = (high - low) * HEADROOM or 1
+			self.edges = np.linspace(low - margin, high + margin, self.bins + 1)
+			self.counts = np.histogram(values, self.edges)[0]
+			for bar in self.bars:
+				bar.remove()
+			self.bars = list(self.ax_hist.bar(self.edges[:-1], self.counts, width=np.diff(self.edges),
+											  align='edge', alpha=0.7, animated=True))
+			self.ax_hist.set_xlim(self.edges[0], self.edges[-1])
+			self.ax_hist.set_ylim(0, self.counts.max() * (1 + HEADROOM))
+			return True
+		self.counts += np.histogram(changes, self.edges)[0]
+		for bar, count in zip(self.bars, self.counts):
+			bar.set_height(count)
+		if self.counts.max() > self.ax_hist.get_ylim()[1]:
+			self.ax_hist.set_ylim(0, self.counts.max() * (1 + HEADROOM))
+			return True
+		return False
+
+
+def run_live(args):
+	"""Watch the first CSV and redraw its charts at most args.fps times a second until the window closes"""
+	csvs = expand_paths(args.csvs)
+	if not csvs:
+		return
+	if len(csvs) > 1:
+		print(f"⚠️  --live follows one file; using {csvs[0]}")
+	view = LiveView(csvs[0])
+	view.update()
+	print(f"🔴 Live: {view.rows:,} rows from {csvs[0]}; watching for new rows "
+		  f"(at most {args.fps:g} redraws/sec, close the window to stop)")
+	# The timer is the rate cap: however fast rows arrive, the file is read and drawn once per tick
+	timer = view.fig.canvas.new_timer(interval=int(1000 / args.fps))
+	timer.add_callback(view.update)
+	timer.start()
+	plt.show()
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# (name, arguments after `python -X importtime`)
+CASES = [
+	('import', ['-c', 'import csv_data_visualizer']),
+	('summary', ['csv_data_visualizer.py', '--summary']),
+	('plotting', ['-c', 'import csv_data_visualizer; csv_data_visualizer.use_plotting()']),
+]
+PLOTTING = ('matplotlib', 'seaborn')
+ENTRY = 'csv_data_visualizer'
+
+
+def import_times(arguments):
+	"""Run Python with -X importtime.
+
+	Returns the wall seconds, the total import seconds, the imports worth
+	listing as {module: cumulative seconds} and the names of every module
+	imported. The listed imports are the top-level ones, except that
+	csv_data_visualizer itself is replaced by the modules it imports directly.
+	"""
+	started = time.perf_counter()
+	result = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=HERE,
+							capture_output=True, text=True, check=True)
+	wall = time.perf_counter() - started
+	total, listed, names, children = 0.0, {}, set(), {}
+	for line in result.stderr.splitlines():
+		# "import time: self [us] | cumulative | imported package"; a module follows its nested imports,
+		# which are indented two more spaces
+		if not line.startswith('import time:'):
+			continue
+		fields = line[len('import time:'):].split('|')
+		if len(fields) != 3 or not fields[1].strip().isdigit():
+			continue
+		name, seconds = fields[2].strip(), int(fields[1]) / 1e6
+		depth = (len(fields[2]) - len(fields[2].lstrip()) - 1) // 2
+		names.add(name)
+		if depth == 1:
+			children[name] = seconds
+		elif depth == 0:
+			total += seconds
+			listed.update(children if name == ENTRY else {name: seconds})
+			children = {}
+	return wall, total, listed, names
+
+def measure(repeat=3, top=5):
+	"""Best-of-repeat wall and import time of every case, with the slowest top-level imports"""
+	results = {}
+	for name, arguments in CASES:
+		runs = [import_times(arguments) for _ in range(repeat)]
+		wall, total, listed, names = min(runs, key=lambda run: run[0])
+		slowest = sorted(listed.items(), key=lambda item: item[1], reverse=True)[:top]
+		results[name] = {
+			'wall_seconds': round(wall, 3),
+			'import_seconds': round(total, 3),
+			'plotting_loaded': any(module in names for module in PLOTTING),
+			'slowest': {module: round(seconds, 3) for module, seconds in slowest},
+		}
+		print(f"{name:>9}: {wall:.2f}s wall, {total:.2f}s importing"
+			  f"{', plotting libraries loaded' if results[name]['plotting_loaded'] else ''}")
+		for module, seconds in slowest:
+			print(f"{'':>11}{module:<24} {seconds:.3f}s")
+	return results
+
+def compare_results(previous, current):
+	"""Print the wall time change of every case present in both runs"""
+	print("\n📊 COMPARED WITH PREVIOUS RUN:")
+	for name, result in current.items():
+		old = previous.get(name)
+		if not old:
+			continue
+		change = (result['wall_seconds'] / old['wall_seconds'] - 1) * 100
+		marker = '⚠️ ' if change > 10 else '  '
+		print(f"{marker}{name:>9}: {old['wall_seconds']:.2f}s -> {result['wall_seconds']:.2f}s ({change:+.1f}%)")
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Measure the cold-start time of csv_data_visualizer.py with -X importtime')
+	parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the fastest counts (default: 3)')
+	parser.add_argument('--top', type=int, default=5, help='Slowest imports to list per case (default: 5)')
+	parser.add_argument('--output', '-o', help='Write results as JSON to this file')
+	parser.add_argument('--compare', help='Earlier JSON results to compare against')
+	args = parser.parse_args()
+
+	print(f"⏱️  STARTUP TIME (best of {args.repeat}):")
+	results = measure(args.repeat, args.top)
+	if args.output:
+		with open(args.output, 'w', encoding='utf-8') as file:
+			json.dump(results, file, indent=2)
+		print(f"💾 Results saved to {args.output}")
+	if args.compare:
+		with open(args.compare, 'r', encoding='utf-8') as file:
+			compare_results(json.load(file), results)
+
+
+if __name__ == "__main__":
+	main()
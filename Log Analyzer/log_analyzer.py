@@ -1,79 +1,175 @@
-import re
-from datetime import datetime
+import os
+import sys
+import time
+import heapq
+import pickle
+import hashlib
+import cProfile
+from itertools import islice
+from contextlib import nullcontext
 from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 import argparse
+from log_formats import FORMATS, get_parser, decode_time_prefix, timestamp_seconds
+from log_input import detect_compression, expand_paths, read_lines
+from sketches import SpaceSaving, HyperLogLog, KLLSketch
+from security_rules import AhoCorasick, SlidingWindowDetector, DEFAULT_SIGNATURES, load_signatures
+from profiling import RunProfiler
 
 
-def analyze_time_patterns(timestamps):
+TIME_BUCKETS = ('hour-of-day', 'minute', 'hour', 'day')
+BAR_WIDTH = 50  # characters in the longest time-analysis bar
+
+@lru_cache(maxsize=4096)
+def time_bucket(prefix, bucket):
+    """Return the histogram bucket key for a timestamp prefix, or None"""
+    parts = decode_time_prefix(prefix)
+    if parts is None:
+        return None
+    if bucket == 'hour-of-day':
+        return parts[3]
+    if bucket == 'day':
+        return parts[:3]
+    if bucket == 'hour':
+        return parts[:4]
+    return parts
+
+def format_time_bucket(key, bucket):
+    """Turn a bucket key back into a display label"""
+    if bucket == 'hour-of-day':
+        return f"{key:02d}:00"
+    label = f"{key[0]:04d}-{key[1]:02d}-{key[2]:02d}"
+    if bucket == 'hour':
+        label += f" {key[3]:02d}:00"
+    elif bucket == 'minute':
+        label += f" {key[3]:02d}:{key[4]:02d}"
+    return label
+
+def analyze_time_patterns(time_counts, bucket='hour-of-day'):
     print("\n⏰ TIME ANALYSIS:")
     
-    hour_counts = defaultdict(int)
-    
-    for timestamp_str in timestamps:
-        try:
-            # Parse: "15/Aug/2025:08:15:32 +0000"
-            dt = datetime.strptime(timestamp_str, "%d/%b/%Y:%H:%M:%S %z")
-            hour_counts[dt.hour] += 1
-        except:
-            continue
-    
-    print("Requests by hour:")
-    for hour in sorted(hour_counts.keys()):
-        count = hour_counts[hour]
-        bar = "█" * (count // 2)  # Simple bar chart
-        print(f"{hour:02d}:00 - {count:3d} requests {bar}")
+    print(f"Requests by {'hour' if bucket == 'hour-of-day' else bucket}:")
+    # One block per two requests, scaled down so the busiest bucket's bar is at most BAR_WIDTH
+    max_count = max(time_counts.values(), default=0)
+    for key in sorted(time_counts.keys()):
+        count = time_counts[key]
+        bar = "█" * min(count // 2, count * BAR_WIDTH // max_count)
+        print(f"{format_time_bucket(key, bucket)} - {count:3d} requests {bar}")
 
-def analyze_security_threats(stats):
+def analyze_security_threats(stats, top=5):
     print("\n🛡️  SECURITY ANALYSIS:")
     
-    # Check for suspicious paths
-    suspicious_paths = ['/admin', '/wp-admin', '/.env', '/phpmyadmin', '/config.php']
-    threats_found = 0
-    
-    for path in stats['path_counts']:
-        for suspicious in suspicious_paths:
-            if suspicious in path:
-                count = stats['path_counts'][path]
-                print(f"⚠️  Suspicious access: {path} ({count} times)")
-                threats_found += 1
+    # Suspicious paths were matched against the rule set while the log was read
+    for path, count in top_items(stats['suspicious_paths'], top):
+        print(f"⚠️  Suspicious access: {path} ({count} times)")
+    if len(stats['suspicious_paths']) > top:
+        print(f"... and {len(stats['suspicious_paths']) - top} more paths")
     
-    if threats_found == 0:
+    if stats['rule_counts']:
+        signatures = stats['security_rules'].signatures
+        print("\nMatches by rule:")
+        for rule, count in top_items(stats['rule_counts'], len(stats['rule_counts'])):
+            print(f"  {signatures[rule]}: {count} requests")
+    else:
         print("✅ No obvious security threats detected")
     
-    # Check for brute force (many 401s from same IP)
+    # Per-IP rates were checked against sliding-window thresholds as lines arrived
     print("\n🔒 POTENTIAL BRUTE FORCE ATTACKS:")
-    for ip, count in stats['ip_counts'].items():
-        if count > 10:  # More than 10 requests from one IP
-            print(f"⚠️  High activity from {ip}: {count} requests")
-
-def parse_log_line(line, pattern):
-    """Parse a single log line and return extracted data"""
-    match = re.match(pattern, line.strip())
-    if match:
-        return match.groups()
-    return None
+    detector = stats['rate_detector']
+    if detector is None or not detector.alerts:
+        print("✅ No rate anomalies detected")
+        return
+    messages = {
+        'requests': "High request rate from {ip}: {count} requests",
+        '4xx': "Error burst from {ip}: {count} 4xx responses",
+        '401': "Possible brute force from {ip}: {count} 401 responses",
+    }
+    ranked = sorted(detector.alerts.items(), key=lambda item: max(peak for peak, _ in item[1].values()),
+                    reverse=True)
+    for ip, alerts in ranked[:top]:
+        for kind in SlidingWindowDetector.KINDS:
+            if kind in alerts:
+                count, first = alerts[kind]
+                started = datetime.fromtimestamp(first, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"⚠️  {messages[kind].format(ip=ip, count=count)} "
+                      f"within {detector.window}s (first at {started})")
+    if len(ranked) > top:
+        print(f"... and {len(ranked) - top} more IPs")
 
-def update_statistics(stats, ip, timestamp, request, status, size):
-    """Update statistics with parsed data"""
+def parse_log_line(line, parser):
+    """Parse a single log line into a LogRecord, or None if it does not match"""
+    return parser(line)
+
+def update_statistics(stats, record):
+    """Update statistics with a parsed LogRecord"""
     stats['total_requests'] += 1
-    stats['ip_counts'][ip] += 1
-    stats['status_counts'][status] += 1
-    stats['timestamps'].append(timestamp)
+    if stats['approx']:
+        stats['ip_counts'].add(record.ip)
+        stats['unique_ips'].add(record.ip)
+    else:
+        stats['ip_counts'][record.ip] += 1
+    stats['status_counts'][record.status] += 1
+    # Consecutive lines share the same minute, so the decoded prefix is almost always cached
+    key = time_bucket(record.timestamp[:17], stats['time_bucket'])
+    if key is not None:
+        stats['time_counts'][key] += 1
+    if stats['size_sketch'] is not None:
+        size = record.size
+        stats['bytes_sent'] += size
+        stats['size_sketch'].add(size)
+        status_sketch = stats['status_sizes'].get(record.status)
+        if status_sketch is None:
+            status_sketch = stats['status_sizes'][record.status] = KLLSketch()
+        status_sketch.add(size)
+        if stats['approx']:
+            stats['ip_bytes'].add(record.ip, size)
+            if record.path is not None:
+                stats['path_bytes'].add(record.path, size)
+        else:
+            stats['ip_bytes'][record.ip] += size
+            if record.path is not None:
+                stats['path_bytes'][record.path] += size
+    if stats['rate_detector'] is not None:
+        seconds = timestamp_seconds(record.timestamp)
+        if seconds is not None:
+            stats['rate_detector'].observe(record.ip, seconds, record.status)
     
-    request_parts = request.split()
-    if len(request_parts) >= 2:
-        method, path = request_parts[0], request_parts[1]
-        stats['method_counts'][method] += 1
-        stats['path_counts'][path] += 1
+    if record.path is not None:
+        stats['method_counts'][record.method] += 1
+        if stats['approx']:
+            stats['path_counts'].add(record.path)
+        else:
+            stats['path_counts'][record.path] += 1
+        if stats['security_rules'] is not None:
+            rules = stats['security_rules'].match(record.path)
+            if rules:
+                stats['suspicious_paths'][record.path] += 1
+                for rule in rules:
+                    stats['rule_counts'][rule] += 1
+
+def top_items(counts, n):
+    """The n largest (key, count) pairs, ties kept in first-seen order"""
+    if isinstance(counts, SpaceSaving):
+        return counts.top(n)
+    return heapq.nlargest(n, counts.items(), key=itemgetter(1))
 
-def generate_report(stats):
+def generate_report(stats, top=5):
     """Generate and print analysis report"""
     print("\n=== LOG ANALYSIS REPORT ===")
     print(f"Total Requests: {stats['total_requests']}")
-    print(f"Unique IPs: {len(stats['ip_counts'])}")
+    if stats['approx']:
+        unique_ips = stats['unique_ips']
+        print(f"Unique IPs: ~{unique_ips.estimate()} (±{unique_ips.relative_error() * 100:.1f}%)")
+    else:
+        print(f"Unique IPs: {len(stats['ip_counts'])}")
+    if stats['malformed_lines']:
+        print(f"Malformed Lines: {stats['malformed_lines']} (first: {stats['malformed_sample']!r})")
 
-    print("\nTOP 5 IP ADDRESSES:")
-    for i, (ip, count) in enumerate(sorted(stats['ip_counts'].items(), key=lambda x: x[1], reverse=True)[:5], 1):
+    print(f"\nTOP {top} IP ADDRESSES:")
+    for i, (ip, count) in enumerate(top_items(stats['ip_counts'], top), 1):
         print(f"{i}. {ip}: {count} requests")
 
     print("\nSTATUS CODE DISTRIBUTION:")
@@ -86,54 +182,521 @@ def generate_report(stats):
         percentage = (count / stats['total_requests']) * 100
         print(f"{method}: {count} ({percentage:.1f}%)")
 
-    print("\nTOP 5 REQUESTED PATHS:")
-    for i, (path, count) in enumerate(sorted(stats['path_counts'].items(), key=lambda x: x[1], reverse=True)[:5], 1):
+    print(f"\nTOP {top} REQUESTED PATHS:")
+    for i, (path, count) in enumerate(top_items(stats['path_counts'], top), 1):
         print(f"{i}. {path}: {count} requests")
 
+    if stats['approx']:
+        print(f"\n(approximate counts: IPs may be over by up to {stats['ip_counts'].error_bound()}, "
+              f"paths by up to {stats['path_counts'].error_bound()})")
+
+def format_percentiles(sketch):
+    """p50/p95/p99/max line for a KLLSketch of response sizes"""
+    p50, p95, p99 = sketch.quantiles([0.50, 0.95, 0.99])
+    return f"p50 {p50:,}  p95 {p95:,}  p99 {p99:,}  max {sketch.maximum:,} bytes"
+
+def analyze_response_sizes(stats, top=5):
+    print("\n📦 RESPONSE SIZES:")
+    total = stats['total_requests']
+    average = stats['bytes_sent'] / total if total else 0
+    print(f"Total bytes served: {stats['bytes_sent']:,} (avg {average:,.0f} per request)")
+    if not stats['size_sketch'].count:
+        return
+    print(f"All responses: {format_percentiles(stats['size_sketch'])}")
+
+    print("\nSizes by status:")
+    for status, sketch in sorted(stats['status_sizes'].items()):
+        print(f"{status}: {format_percentiles(sketch)} ({sketch.count} responses)")
+
+    print(f"\nTOP {top} PATHS BY BYTES:")
+    for i, (path, size) in enumerate(top_items(stats['path_bytes'], top), 1):
+        requests = stats['path_counts'][path] if path in stats['path_counts'] else None
+        average = f", avg {size / requests:,.0f}" if requests else ""
+        print(f"{i}. {path}: {size:,} bytes{average}")
+
+    print(f"\nTOP {top} IPS BY BYTES:")
+    for i, (ip, size) in enumerate(top_items(stats['ip_bytes'], top), 1):
+        print(f"{i}. {ip}: {size:,} bytes")
+
+def create_statistics(time_bucket='hour-of-day', approx=False, sketch_size=1000, security_rules=None,
+                      rate_limits=None, track_sizes=False):
+    """Create an empty statistics dictionary
+
+    With approx=True the IP and path counters are fixed-size Space-Saving
+    summaries and unique IPs are estimated with a HyperLogLog. When an
+    AhoCorasick matcher is given, every path is checked against it as it is read,
+    and rate_limits (SlidingWindowDetector keyword arguments) enables per-IP
+    rate detection. track_sizes adds bytes per path/IP and KLL size quantiles.
+    """
+    return {
+        'total_requests': 0,
+        'malformed_lines': 0,
+        'malformed_sample': None,
+        'approx': approx,
+        'ip_counts': SpaceSaving(sketch_size) if approx else defaultdict(int),
+        'unique_ips': HyperLogLog() if approx else None,
+        'status_counts': defaultdict(int),
+        'path_counts': SpaceSaving(sketch_size) if approx else defaultdict(int),
+        'method_counts': defaultdict(int),
+        'time_bucket': time_bucket,
+        'time_counts': defaultdict(int),
+        'security_rules': security_rules,
+        'suspicious_paths': defaultdict(int),
+        'rule_counts': defaultdict(int),
+        'rate_detector': SlidingWindowDetector(**rate_limits) if rate_limits is not None else None,
+        'bytes_sent': 0,
+        'size_sketch': KLLSketch() if track_sizes else None,
+        'status_sizes': {},
+        'ip_bytes': SpaceSaving(sketch_size) if approx else defaultdict(int),
+        'path_bytes': SpaceSaving(sketch_size) if approx else defaultdict(int)
+    }
+
+def merge_statistics(stats, chunk_stats):
+    """Fold the statistics of one chunk into the running totals"""
+    stats['total_requests'] += chunk_stats['total_requests']
+    stats['malformed_lines'] += chunk_stats['malformed_lines']
+    if stats['malformed_sample'] is None:
+        stats['malformed_sample'] = chunk_stats['malformed_sample']
+    for key in ('ip_counts', 'status_counts', 'path_counts', 'method_counts', 'time_counts',
+                'suspicious_paths', 'rule_counts', 'ip_bytes', 'path_bytes'):
+        if isinstance(stats[key], SpaceSaving):
+            stats[key].merge(chunk_stats[key])
+            continue
+        for item, count in chunk_stats[key].items():
+            stats[key][item] += count
+    if stats['approx']:
+        stats['unique_ips'].merge(chunk_stats['unique_ips'])
+    if stats['rate_detector'] is not None:
+        stats['rate_detector'].merge(chunk_stats['rate_detector'])
+    if stats['size_sketch'] is not None:
+        stats['bytes_sent'] += chunk_stats['bytes_sent']
+        stats['size_sketch'].merge(chunk_stats['size_sketch'])
+        for status, sketch in chunk_stats['status_sizes'].items():
+            if status in stats['status_sizes']:
+                stats['status_sizes'][status].merge(sketch)
+            else:
+                stats['status_sizes'][status] = sketch
+
+BATCH_LINES = 4096
+SAMPLE_LENGTH = 200
+
+def record_malformed(stats, line):
+    """Count a line that could not be used, keeping the first one as an example"""
+    stats['malformed_lines'] += 1
+    if stats['malformed_sample'] is None:
+        stats['malformed_sample'] = line.rstrip('\n')[:SAMPLE_LENGTH]
+
+def process_lines(lines, parser, stats, profiler=None):
+    """Parse lines into stats, counting lines that cannot be parsed; returns the number of lines"""
+    if profiler is not None:
+        return process_batches(lines, parser, stats, profiler)
+    line_count = 0
+    for line in lines:
+        line_count += 1
+        try:
+            record = parse_log_line(line, parser)
+            if record:
+                update_statistics(stats, record)
+            else:
+                record_malformed(stats, line)
+        except Exception:
+            record_malformed(stats, line)
+    return line_count
+
+def parse_or_none(line, parser):
+    try:
+        return parse_log_line(line, parser)
+    except Exception:
+        return None
+
+def process_batches(lines, parser, stats, profiler):
+    """process_lines in batches, timing the read, parse and update stages of each batch"""
+    lines = iter(lines)
+    wall_clock, cpu_clock = time.perf_counter, time.process_time
+    line_count = 0
+    while True:
+        wall, cpu = wall_clock(), cpu_clock()
+        batch = list(islice(lines, BATCH_LINES))
+        profiler.add('read', wall_clock() - wall, cpu_clock() - cpu)
+        if not batch:
+            return line_count
+
+        wall, cpu = wall_clock(), cpu_clock()
+        try:
+            records = [parse_log_line(line, parser) for line in batch]
+        except Exception:
+            records = [parse_or_none(line, parser) for line in batch]
+        profiler.add('parse', wall_clock() - wall, cpu_clock() - cpu)
+
+        wall, cpu = wall_clock(), cpu_clock()
+        malformed = stats['malformed_lines']
+        for line, record in zip(batch, records):
+            try:
+                if record:
+                    update_statistics(stats, record)
+                else:
+                    record_malformed(stats, line)
+            except Exception:
+                record_malformed(stats, line)
+        profiler.add('update', wall_clock() - wall, cpu_clock() - cpu)
+
+        line_count += len(batch)
+        # Bytes are counted by the reader as it hands over raw blocks
+        profiler.count(len(batch), 0, stats['malformed_lines'] - malformed)
+
+def find_chunk_boundaries(filename, chunks, start=0, end=None):
+    """Split a byte range of a file into chunks that start and end on line boundaries"""
+    if end is None:
+        end = os.path.getsize(filename)
+    boundaries = [start]
+    with open(filename, 'rb') as file:
+        for i in range(1, chunks):
+            # Step back one byte so a chunk that already starts a line is kept
+            file.seek(max(start + (end - start) * i // chunks - 1, start))
+            file.readline()
+            position = min(file.tell(), end)
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    if end > boundaries[-1]:
+        boundaries.append(end)
+    return list(zip(boundaries, boundaries[1:]))
+
+def analyze_chunk(filename, start, end, log_format, make_statistics, profile=False):
+    """Worker: build partial statistics for one byte range of the log"""
+    stats = make_statistics()
+    profiler = RunProfiler() if profile else None
+    process_lines(read_lines(filename, start, end, profiler), get_parser(log_format), stats, profiler)
+    return stats, profiler
+
+def analyze_parallel(filename, log_format, workers, make_statistics, start=0, end=None, profiler=None):
+    """Analyze a log file in newline-aligned chunks using a process pool"""
+    stats = make_statistics()
+    chunks = find_chunk_boundaries(filename, workers, start, end)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(analyze_chunk,
+                               [filename] * len(chunks),
+                               [start for start, _ in chunks],
+                               [end for _, end in chunks],
+                               [log_format] * len(chunks),
+                               [make_statistics] * len(chunks),
+                               [profiler is not None] * len(chunks))
+        # Merge in file order so ties in the report rank exactly as in a serial run
+        for chunk_stats, chunk_profiler in results:
+            with profiler.stage('merge') if profiler else nullcontext():
+                merge_statistics(stats, chunk_stats)
+            if profiler is not None:
+                # Progress here advances a chunk at a time
+                profiler.merge(chunk_profiler)
+                profiler.count(0, 0, 0)
+    return stats
+
+def analyze_range(stats, filename, start, end, log_format, workers, make_statistics, profiler=None):
+    """Fold the lines between two byte offsets of a log into stats"""
+    # Compressed streams cannot be entered mid-way, so only plain files are split across workers
+    if workers > 1 and not detect_compression(filename):
+        chunk_stats = analyze_parallel(filename, log_format, workers, make_statistics, start, end, profiler)
+        merge_statistics(stats, chunk_stats)
+    else:
+        process_lines(read_lines(filename, start, end, profiler), get_parser(log_format), stats, profiler)
+
+CHECKPOINT_VERSION = 2
+FINGERPRINT_BYTES = 256
+
+def file_fingerprint(filename, size):
+    """Hash of the first bytes of a file, used to notice a file replaced in place"""
+    with open(filename, 'rb') as file:
+        return hashlib.sha1(file.read(size)).hexdigest()
+
+def last_line_end(filename, size):
+    """Offset just past the last newline, so a half-written line waits for the next run"""
+    with open(filename, 'rb') as file:
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            file.seek(position - step)
+            newline = file.read(step).rfind(b'\n')
+            if newline >= 0:
+                return position - step + newline + 1
+            position -= step
+    return 0
+
+def find_rotated_file(filename, inode):
+    """Look next to filename for the file that now has the old inode (e.g. access.log.1)"""
+    path = os.path.abspath(filename)
+    for entry in os.scandir(os.path.dirname(path)):
+        if entry.path != path and entry.is_file() and entry.inode() == inode:
+            return entry.path
+    return None
+
+def plan_resume(filename, saved):
+    """Work out the byte ranges still to read and the new checkpoint entry for a log file"""
+    status = os.stat(filename)
+    if detect_compression(filename):
+        # Archives are not appended to: read them once, then skip them while unchanged
+        if saved and (saved['inode'], saved['size']) == (status.st_ino, status.st_size):
+            print(f"📌 {filename} is unchanged since the last run, skipping")
+            return [], saved
+        return [(filename, 0, None)], {'inode': status.st_ino, 'size': status.st_size}
+
+    ranges = []
+    start = 0
+    if saved and 'offset' in saved and status.st_ino == saved['inode']:
+        if (status.st_size >= saved['offset']
+                and file_fingerprint(filename, saved['head_size']) == saved['fingerprint']):
+            start = saved['offset']
+        else:
+            print(f"🔄 {filename} was truncated, reading from the start")
+    elif saved:
+        rotated = find_rotated_file(filename, saved['inode'])
+        if rotated:
+            rotated_end = last_line_end(rotated, os.path.getsize(rotated))
+            if rotated_end > saved['offset']:
+                ranges.append((rotated, saved['offset'], rotated_end))
+            print(f"🔄 {filename} was rotated to {rotated}, finishing it first")
+        else:
+            print(f"🔄 {filename} was replaced, reading from the start")
+    if start:
+        print(f"📌 Resuming {filename} at byte {start:,}")
+
+    end = max(last_line_end(filename, status.st_size), start)
+    ranges.append((filename, start, end))
+    head_size = min(FINGERPRINT_BYTES, end)
+    entry = {'inode': status.st_ino, 'size': status.st_size, 'offset': end, 'head_size': head_size,
+             'fingerprint': file_fingerprint(filename, head_size)}
+    return ranges, entry
+
+def load_checkpoint(path, settings):
+    """Load saved statistics and file positions, or None if there is no usable checkpoint"""
+    try:
+        with open(path, 'rb') as file:
+            checkpoint = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+        print(f"⚠️  Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('settings') != settings:
+        print(f"⚠️  Checkpoint {path} was made with different options, starting over")
+        return None
+    return checkpoint
+
+def save_checkpoint(path, settings, stats, files):
+    """Atomically write statistics and file positions for the next run"""
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'settings': settings,
+        'stats': dict(stats, security_rules=None),  # rebuilt from the rules on load
+        'files': files,
+    }
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+def read_new_lines(file, pending, profiler=None):
+    """Read the complete lines appended since the last call; a partial last line stays in pending"""
+    data = pending + file.read()
+    end = data.rfind(b'\n') + 1
+    if profiler is not None:
+        profiler.count(0, end, 0)
+    lines = data[:end].decode('utf-8', errors='replace').splitlines()
+    return lines, data[end:]
+
+def follow_log(filename, parser, make_statistics, interval, report, profiler=None):
+    """Tail a growing log, printing a report of the new lines every interval seconds.
+
+    Starts at the current end of the file. A changed inode (rotation) makes it
+    finish the old file and reopen the new one from the start; a file that
+    shrinks (truncation) is re-read from the start. Returns the cumulative stats.
+    """
+    totals = make_statistics()
+    delta = make_statistics()
+    file = open(filename, 'rb')
+    file.seek(0, os.SEEK_END)
+    inode = os.fstat(file.fileno()).st_ino
+    pending = b''
+    next_report = time.monotonic() + interval
+    print(f"📡 Following {filename} (report every {interval}s, Ctrl+C to stop)")
+
+    try:
+        while True:
+            lines, pending = read_new_lines(file, pending, profiler)
+            process_lines(lines, parser, delta, profiler)
+
+            try:
+                current = os.stat(filename)
+            except FileNotFoundError:
+                current = None  # Rotated away and not recreated yet
+            if current is not None and current.st_ino != inode:
+                lines, _ = read_new_lines(file, pending + b'\n' if pending else b'', profiler)
+                process_lines(lines, parser, delta, profiler)
+                file.close()
+                file = open(filename, 'rb')
+                inode = os.fstat(file.fileno()).st_ino
+                pending = b''
+                print(f"🔄 {filename} was rotated, reading the new file")
+            elif current is not None and current.st_size < file.tell():
+                file.seek(0)
+                pending = b''
+                print(f"🔄 {filename} was truncated, reading from the start")
+
+            if time.monotonic() >= next_report:
+                print(f"\n📡 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: "
+                      f"{delta['total_requests']} new requests in the last {interval}s")
+                if delta['total_requests']:
+                    report(delta)
+                # Keep the rate windows running across reports; only the alerts start over
+                detector = delta['rate_detector']
+                merge_statistics(totals, delta)
+                delta = make_statistics()
+                if detector is not None:
+                    detector.alerts = {}
+                    delta['rate_detector'] = detector
+                next_report = time.monotonic() + interval
+            time.sleep(min(interval, 0.5))
+    except KeyboardInterrupt:
+        merge_statistics(totals, delta)
+        print("\n🛑 Stopped following")
+    finally:
+        file.close()
+    return totals
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Analyze Apache/Nginx log files')
-    parser.add_argument('logfile', help='Path to log file')
+    parser.add_argument('logfiles', nargs='+', metavar='logfile',
+                        help='Log files or glob patterns; .gz, .bz2 and .xz are read directly')
     parser.add_argument('--top', type=int, default=5, help='Number of top results to show')
     parser.add_argument('--security', action='store_true', help='Enable security analysis')
+    parser.add_argument('--rules', help='File of suspicious path signatures, one per line (implies --security)')
+    parser.add_argument('--window', type=int, default=60,
+                        help='Sliding window in seconds for per-IP rate checks (default: 60)')
+    parser.add_argument('--max-requests', type=int, default=60,
+                        help='Requests per window from one IP that raise an alert (default: 60)')
+    parser.add_argument('--max-4xx', type=int, default=10,
+                        help='4xx responses per window to one IP that raise an alert (default: 10)')
+    parser.add_argument('--max-401', type=int, default=5,
+                        help='401 responses per window to one IP that raise an alert (default: 5)')
+    parser.add_argument('--follow', action='store_true',
+                        help='Keep watching the log and report new lines every --interval seconds')
+    parser.add_argument('--interval', type=float, default=60,
+                        help='Seconds between reports in --follow mode (default: 60)')
+    parser.add_argument('--state', metavar='FILE',
+                        help='Checkpoint file: resume from the last run and only read new bytes')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes to analyze the file with (default: 1)')
+    parser.add_argument('--format', default='common', choices=sorted(FORMATS),
+                        help='Log format to parse (default: common, which also reads combined logs)')
+    parser.add_argument('--bucket', default='hour-of-day', choices=TIME_BUCKETS,
+                        help='Time histogram bucket size (default: hour-of-day)')
+    parser.add_argument('--sizes', action='store_true',
+                        help='Report bandwidth per path/IP and response size percentiles')
+    parser.add_argument('--approx', action='store_true',
+                        help='Use fixed-memory sketches for top IPs/paths and unique IPs')
+    parser.add_argument('--sketch-size', type=int, default=1000,
+                        help='Keys tracked per top-N sketch in --approx mode (default: 1000)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print wall/CPU time per stage, throughput and the malformed-line rate')
+    parser.add_argument('--progress', type=float, nargs='?', const=5, metavar='SECONDS',
+                        help='Print throughput to stderr every SECONDS while reading (default: 5)')
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help='Write cProfile statistics of the run to FILE (view with python3 -m pstats FILE)')
     return parser.parse_args()
     
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ('cache', 'query'):
+        # Subcommands for the columnar cache; the plain `log_analyzer.py access.log` form is unchanged
+        import log_cache
+        log_cache.main(sys.argv[1:])
+        return
+
     args = parse_arguments()
-    filename = args.logfile
-    pattern = r'(\d+\.\d+\.\d+\.\d+).*?\[(.*?)\] "(.*?)" (\d+) (\d+)'
+    filenames = expand_paths(args.logfiles)
+    if not filenames:
+        return
+    profiler = RunProfiler(args.progress) if args.profile or args.progress else None
+    code_profiler = cProfile.Profile() if args.cprofile else None
+    if code_profiler is not None:
+        code_profiler.enable()
 
-    stats = {
-        'total_requests': 0,
-        'ip_counts': defaultdict(int),
-        'status_counts': defaultdict(int),
-        'path_counts': defaultdict(int),
-        'method_counts': defaultdict(int),
-        'timestamps': []
-    }
+    analyze_logs(args, filenames, profiler)
+
+    if code_profiler is not None:
+        code_profiler.disable()
+        code_profiler.dump_stats(args.cprofile)
+        print(f"\n💾 cProfile statistics written to {args.cprofile} (python3 -m pstats {args.cprofile})")
+    if args.profile:
+        profiler.report()
+
+def analyze_logs(args, filenames, profiler=None):
+    """Run the analysis selected on the command line and print its reports"""
+    stage = profiler.stage if profiler is not None else lambda name: nullcontext()
+    security_rules = rate_limits = signatures = None
+    if args.security or args.rules:
+        args.security = True
+        signatures = load_signatures(args.rules) if args.rules else DEFAULT_SIGNATURES
+        security_rules = AhoCorasick(signatures)
+        rate_limits = {'window': args.window, 'max_requests': args.max_requests,
+                       'max_errors': args.max_4xx, 'max_unauthorized': args.max_401}
+        covered = SlidingWindowDetector(window=args.window).window
+        if covered != args.window:
+            print(f"ℹ️  --window {args.window} rounded up to {covered}s, a whole number of rate slots")
+    make_statistics = partial(create_statistics, args.bucket, args.approx, args.sketch_size,
+                              security_rules, rate_limits, args.sizes)
+
+    if args.follow:
+        if len(filenames) > 1:
+            print("❌ --follow watches a single log file")
+            return
+        stats = follow_log(filenames[0], get_parser(args.format), make_statistics, args.interval,
+                           partial(print_reports, args=args), profiler)
+        if stats['total_requests']:
+            print("\nTotals while following:")
+            print_reports(stats, args)
+        return
+
+    stats = make_statistics()
+    if args.state:
+        settings = {'format': args.format, 'bucket': args.bucket, 'approx': args.approx,
+                    'sketch_size': args.sketch_size, 'signatures': signatures, 'rate_limits': rate_limits,
+                    'sizes': args.sizes}
+        with stage('checkpoint'):
+            checkpoint = load_checkpoint(args.state, settings)
+        files = {}
+        if checkpoint:
+            stats = checkpoint['stats']
+            stats['security_rules'] = security_rules
+            files = checkpoint['files']
+        ranges = []
+        for filename in filenames:
+            key = os.path.abspath(filename)
+            file_ranges, files[key] = plan_resume(filename, files.get(key))
+            ranges.extend(file_ranges)
+    else:
+        ranges = [(filename, 0, None) for filename in filenames]
+
+    for path, start, end in ranges:
+        analyze_range(stats, path, start, end, args.format, args.workers, make_statistics, profiler)
+
+    if args.state:
+        with stage('checkpoint'):
+            save_checkpoint(args.state, settings, stats, files)
+
+    with stage('report'):
+        print_reports(stats, args)
+
+def print_reports(stats, args):
+    """Print the report sections selected on the command line"""
+    generate_report(stats, args.top)
     
-    with open(filename, 'r') as file:
-        for line_number, line in enumerate(file, 1):
-            try:
-                parsed_data = parse_log_line(line, pattern)
-                if parsed_data:
-                    ip, timestamp, request, status, size = parsed_data
-                    update_statistics(stats, ip, timestamp, request, status, size)
-                else:
-                    print(f"Line {line_number}: Invalid log format")
-            except ValueError as e:
-                print(f"Line {line_number}: Data parsing error - {e}")
-            except Exception as e:
-                print(f"Line {line_number}: Unexpected error - {e}")
-
-    # Generate reports
-    generate_report(stats)
+    if args.sizes:
+        analyze_response_sizes(stats, args.top)
     
     if args.security:
-        analyze_security_threats(stats)
+        analyze_security_threats(stats, args.top)
     
-    if stats['timestamps']:
-        analyze_time_patterns(stats['timestamps'])
+    if stats['time_counts']:
+        analyze_time_patterns(stats['time_counts'], stats['time_bucket'])
 
 
 
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from functools import partial
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from log_formats import FORMATS, get_parser
+from log_input import read_lines
+from log_generator import write_log
+from log_analyzer import create_statistics, update_statistics, analyze_range, print_reports
+from security_rules import AhoCorasick, DEFAULT_SIGNATURES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MODES = ('serial', 'approx', 'sizes', 'security', 'workers')
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process and its finished children, in MB"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def mode_settings(mode, workers):
+    """Statistics factory, worker count and report switches for a benchmark mode"""
+    security_rules = rate_limits = None
+    if mode == 'security':
+        security_rules = AhoCorasick(DEFAULT_SIGNATURES)
+        rate_limits = {}
+    make_statistics = partial(create_statistics, 'hour-of-day', mode == 'approx', 1000,
+                              security_rules, rate_limits, mode == 'sizes')
+    report = argparse.Namespace(top=5, sizes=mode == 'sizes', security=mode == 'security')
+    return make_statistics, (workers if mode == 'workers' else 1), report
+
+def timed(function):
+    """Run function() and return its result with wall and CPU seconds"""
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = function()
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+def run_case(filename, log_format, mode, workers):
+    """Benchmark one parser/mode pair; runs in a fresh process so peak RSS is its own.
+
+    Stages are measured by growing passes over the file (read only, read and
+    parse, read/parse/update) and taking the differences, so the timed code is
+    the same streaming loop the analyzer runs and no stage holds the whole file.
+    Worker mode only reports the end-to-end pass.
+    """
+    parser = get_parser(log_format)
+    make_statistics, worker_count, report = mode_settings(mode, workers)
+    stages = {}
+
+    if worker_count == 1:
+        lines, read_wall, read_cpu = timed(lambda: sum(1 for _ in read_lines(filename)))
+        _, parse_wall, parse_cpu = timed(lambda: sum(1 for line in read_lines(filename) if parser(line)))
+        stages['read'] = {'wall': read_wall, 'cpu': read_cpu}
+        stages['parse'] = {'wall': parse_wall - read_wall, 'cpu': parse_cpu - read_cpu}
+
+        def analyze():
+            stats = make_statistics()
+            for line in read_lines(filename):
+                record = parser(line)
+                if record:
+                    update_statistics(stats, record)
+            return stats
+        stats, total_wall, total_cpu = timed(analyze)
+        stages['update'] = {'wall': total_wall - parse_wall, 'cpu': total_cpu - parse_cpu}
+    else:
+        lines = sum(1 for _ in read_lines(filename))
+        stats = make_statistics()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            _, total_wall, total_cpu = timed(
+                lambda: analyze_range(stats, filename, 0, None, log_format, worker_count, make_statistics))
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        _, report_wall, report_cpu = timed(lambda: print_reports(stats, report))
+    stages['report'] = {'wall': report_wall, 'cpu': report_cpu}
+    elapsed = total_wall + report_wall
+
+    return {
+        'format': log_format,
+        'mode': mode,
+        'workers': worker_count,
+        'lines': lines,
+        'parsed': stats['total_requests'],
+        'seconds': round(elapsed, 4),
+        'lines_per_sec': round(lines / elapsed) if elapsed else None,
+        'mb_per_sec': round(os.path.getsize(filename) / 1e6 / elapsed, 2) if elapsed else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': {name: {kind: round(value, 4) for kind, value in times.items()}
+                   for name, times in stages.items()},
+    }
+
+def git_commit():
+    """Current commit hash, so saved results say which code they measured"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(lines, formats, modes, seed=42, workers=None, logfile=None):
+    """Generate (or use) a log and benchmark every format/mode pair"""
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        files = {}
+        for log_format in formats:
+            family = 'json' if log_format == 'json' else 'combined'
+            if logfile and family == 'combined':
+                files[family] = logfile
+            elif family not in files:
+                files[family] = os.path.join(directory, f"bench.{family}.log")
+                write_log(files[family], lines, seed=seed, log_format=family)
+
+            for mode in modes:
+                # A fresh single-use process per case keeps peak RSS and caches independent
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(run_case, files[family], log_format, mode, workers).result()
+                results.append(result)
+                print(f"{log_format:>8} {mode:>8}: {result['lines_per_sec']:>10,} lines/sec, "
+                      f"{result['mb_per_sec']:6.1f} MB/s, peak {result['peak_rss_mb']} MB")
+
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'lines': lines,
+        'seed': seed,
+        'logfile': logfile,
+        'results': results,
+    }
+
+def compare_results(previous, current):
+    """Print the throughput change of every case present in both runs"""
+    before = {(result['format'], result['mode']): result for result in previous['results']}
+    print(f"\n📊 COMPARED WITH {previous.get('commit') or 'previous run'}:")
+    for result in current['results']:
+        old = before.get((result['format'], result['mode']))
+        if not old or not old['lines_per_sec'] or not result['lines_per_sec']:
+            continue
+        change = (result['lines_per_sec'] / old['lines_per_sec'] - 1) * 100
+        marker = '⚠️ ' if change < -5 else '  '
+        print(f"{marker}{result['format']:>8} {result['mode']:>8}: {old['lines_per_sec']:>10,} -> "
+              f"{result['lines_per_sec']:>10,} lines/sec ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the log analyzer on a synthetic log')
+    parser.add_argument('--lines', type=int, default=200000, help='Lines to generate (default: 200000)')
+    parser.add_argument('--seed', type=int, default=42, help='Generator seed (default: 42)')
+    parser.add_argument('--logfile', help='Benchmark this log instead of a generated one (non-JSON formats)')
+    parser.add_argument('--formats', nargs='+', default=['legacy', 'common', 'combined', 'nginx'],
+                        choices=sorted(FORMATS), help='Parsers to benchmark')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES,
+                        help='Execution modes to benchmark')
+    parser.add_argument('--workers', type=int, help='Processes for the workers mode (default: CPU count)')
+    parser.add_argument('--output', '-o', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier JSON results to compare throughput against')
+    args = parser.parse_args()
+
+    print(f"⏱️  Benchmarking {args.logfile or f'{args.lines:,} generated lines'} (seed {args.seed})")
+    results = run_benchmarks(args.lines, args.formats, args.modes, args.seed, args.workers, args.logfile)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"💾 Results saved to {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            compare_results(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
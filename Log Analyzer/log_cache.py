@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import time
+import argparse
+from array import array
+from datetime import datetime, timedelta
+from log_formats import FORMATS, get_parser, timestamp_seconds
+from log_input import expand_paths, read_lines
+
+CACHE_VERSION = 1
+
+# Column name -> array/NumPy type code. ip, path and method hold dictionary codes.
+COLUMNS = {
+    'timestamp': 'q',  # seconds since the epoch, -1 if the timestamp did not parse
+    'status': 'H',
+    'size': 'q',
+    'method': 'H',
+    'ip': 'I',
+    'path': 'I',
+}
+DICTIONARY_COLUMNS = ('method', 'ip', 'path')
+GROUPS = ('path', 'ip', 'status', 'method', 'minute', 'hour', 'day')
+
+
+def require_numpy():
+    """Import NumPy, which only the cache and query commands need"""
+    try:
+        import numpy
+    except ImportError:
+        sys.exit("❌ The log cache needs NumPy: pip3 install numpy")
+    return numpy
+
+def build_cache(filenames, directory, log_format='common'):
+    """Parse logs once and store them as columns plus dictionaries for the string fields"""
+    np = require_numpy()
+    parser = get_parser(log_format)
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    dictionaries = {name: {} for name in DICTIONARY_COLUMNS}
+    skipped = 0
+    started = time.perf_counter()
+
+    def encode(name, value):
+        codes = dictionaries[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    for filename in filenames:
+        for line in read_lines(filename):
+            record = parser(line)
+            if not record or not record.status.isdigit():
+                skipped += 1
+                continue
+            seconds = timestamp_seconds(record.timestamp)
+            columns['timestamp'].append(-1 if seconds is None else seconds)
+            columns['status'].append(int(record.status))
+            columns['size'].append(record.size)
+            columns['method'].append(encode('method', record.method or ''))
+            columns['ip'].append(encode('ip', record.ip))
+            columns['path'].append(encode('path', record.path or ''))
+
+    os.makedirs(directory, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.frombuffer(values, dtype=values.typecode))
+    for name, codes in dictionaries.items():
+        with open(os.path.join(directory, f"{name}.json"), 'w', encoding='utf-8') as file:
+            json.dump(list(codes), file)
+    rows = len(columns['status'])
+    meta = {'version': CACHE_VERSION, 'rows': rows, 'skipped': skipped, 'format': log_format,
+            'sources': [os.path.abspath(filename) for filename in filenames]}
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+
+    elapsed = time.perf_counter() - started
+    print(f"💾 Cached {rows:,} requests in '{directory}' ({skipped:,} lines skipped, {elapsed:.1f}s)")
+    return meta
+
+def load_cache(directory):
+    """Memory-map the cached columns; nothing is read until a query touches it"""
+    np = require_numpy()
+    with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+    if meta.get('version') != CACHE_VERSION:
+        sys.exit(f"❌ '{directory}' was written by a different version, rebuild it with the cache command")
+    columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in COLUMNS}
+    return meta, columns
+
+def load_dictionary(directory, name):
+    """The list of distinct values a dictionary-encoded column's codes index into"""
+    with open(os.path.join(directory, f"{name}.json"), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def parse_time(text):
+    """'HH:MM' means a time of day; a date or date and time means an absolute moment"""
+    if len(text) <= 8 and ':' in text and '-' not in text:
+        parts = [int(part) for part in text.split(':')]
+        return 'time-of-day', parts[0] * 3600 + parts[1] * 60 + (parts[2] if len(parts) > 2 else 0)
+    moment = datetime.fromisoformat(text)
+    return 'absolute', int((moment.replace(tzinfo=None) - datetime(1970, 1, 1)).total_seconds())
+
+def status_mask(np, statuses, values):
+    """Match exact codes ('500') and classes ('5xx')"""
+    mask = np.zeros(len(statuses), dtype=bool)
+    exact = []
+    for value in values:
+        if value.lower().endswith('xx'):
+            base = int(value[0]) * 100
+            mask |= (statuses >= base) & (statuses < base + 100)
+        else:
+            exact.append(int(value))
+    if exact:
+        mask |= np.isin(statuses, exact)
+    return mask
+
+def query_cache(directory, statuses=None, methods=None, ips=None, path_prefix=None,
+                since=None, until=None, group_by='path', metric='requests', top=10):
+    """Filter and group the cached columns with vectorized NumPy operations and print the result"""
+    np = require_numpy()
+    started = time.perf_counter()
+    meta, columns = load_cache(directory)
+    timestamps = columns['timestamp']
+    mask = np.ones(meta['rows'], dtype=bool)
+
+    if statuses:
+        mask &= status_mask(np, columns['status'], statuses)
+    for name, wanted in (('method', methods), ('ip', ips)):
+        if wanted:
+            dictionary = load_dictionary(directory, name)
+            wanted = set(wanted)
+            mask &= np.isin(columns[name], [code for code, value in enumerate(dictionary) if value in wanted])
+    if path_prefix:
+        paths = load_dictionary(directory, 'path')
+        mask &= np.isin(columns['path'], [code for code, path in enumerate(paths) if path.startswith(path_prefix)])
+    if since or until or group_by in ('minute', 'hour', 'day'):
+        mask &= timestamps >= 0
+    start = parse_time(since) if since else None
+    end = parse_time(until) if until else None
+    if start and end and start[0] == end[0] == 'time-of-day' and start[1] > end[1]:
+        # A time-of-day range that wraps past midnight, e.g. 22:00 to 06:00
+        time_of_day = timestamps % 86400
+        mask &= (time_of_day >= start[1]) | (time_of_day < end[1])
+    else:
+        for bound, keep in ((start, np.greater_equal), (end, np.less)):
+            if bound:
+                kind, seconds = bound
+                mask &= keep(timestamps % 86400 if kind == 'time-of-day' else timestamps, seconds)
+
+    selected = np.flatnonzero(mask)
+    weights = columns['size'][selected].astype(np.float64) if metric == 'bytes' else None
+    matched = len(selected)
+    print(f"\n🔎 QUERY: {matched:,} of {meta['rows']:,} cached requests match")
+
+    if group_by in DICTIONARY_COLUMNS:
+        labels = load_dictionary(directory, group_by)
+        totals = np.bincount(columns[group_by][selected], weights=weights, minlength=len(labels))
+        count = min(top, int(np.count_nonzero(totals)))
+        if count:
+            best = np.argpartition(-totals, count - 1)[:count]
+            best = best[np.argsort(-totals[best], kind='stable')]
+        else:
+            best = []
+        rows = [(labels[code], totals[code]) for code in best]
+        title = f"TOP {top} {group_by.upper()}S BY {metric.upper()}"
+    else:
+        if group_by == 'status':
+            keys = columns['status'][selected]
+        else:
+            keys = timestamps[selected] // {'minute': 60, 'hour': 3600, 'day': 86400}[group_by]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=weights, minlength=len(unique))
+        rows = [(format_group(group_by, key), total) for key, total in zip(unique.tolist(), totals)]
+        title = f"{metric.upper()} BY {group_by.upper()}"
+
+    print(f"\n{title}:")
+    unit = 'bytes' if metric == 'bytes' else 'requests'
+    for i, (label, total) in enumerate(rows, 1):
+        print(f"{i}. {label}: {int(total):,} {unit}")
+    print(f"\n⏱️  Query took {time.perf_counter() - started:.3f}s")
+    return rows
+
+def format_group(group_by, key):
+    """Label a status or time-bucket group key"""
+    if group_by == 'status':
+        return str(key)
+    seconds = key * {'minute': 60, 'hour': 3600, 'day': 86400}[group_by]
+    moment = datetime(1970, 1, 1) + timedelta(seconds=seconds)
+    return moment.strftime({'minute': '%Y-%m-%d %H:%M', 'hour': '%Y-%m-%d %H:00', 'day': '%Y-%m-%d'}[group_by])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='log_analyzer.py', description='Columnar log cache and fast queries')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cache = commands.add_parser('cache', help='Parse logs once into a columnar cache directory')
+    cache.add_argument('logfiles', nargs='+', metavar='logfile', help='Log files or glob patterns')
+    cache.add_argument('--output', '-o', required=True, help='Cache directory to write')
+    cache.add_argument('--format', default='common', choices=sorted(FORMATS), help='Log format to parse')
+
+    query = commands.add_parser('query', help='Filter and group a cache directory')
+    query.add_argument('cache', help='Cache directory written by the cache command')
+    query.add_argument('--status', nargs='+', help='Status codes or classes, e.g. 500 404 5xx')
+    query.add_argument('--method', nargs='+', help='HTTP methods, e.g. GET POST')
+    query.add_argument('--ip', nargs='+', help='Client IP addresses')
+    query.add_argument('--path-prefix', help='Only paths starting with this prefix')
+    query.add_argument('--since', help="Start time: 'HH:MM' (any day) or 'YYYY-MM-DD HH:MM'")
+    query.add_argument('--until', help="End time (exclusive), same forms as --since")
+    query.add_argument('--group-by', default='path', choices=GROUPS, help='Column to group by (default: path)')
+    query.add_argument('--metric', default='requests', choices=('requests', 'bytes'),
+                       help='Count requests or sum bytes (default: requests)')
+    query.add_argument('--top', type=int, default=10, help='Groups to show for path/ip/method (default: 10)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'cache':
+        filenames = expand_paths(args.logfiles)
+        if filenames:
+            build_cache(filenames, args.output, args.format)
+    else:
+        query_cache(args.cache, args.status, args.method, args.ip, args.path_prefix,
+                    args.since, args.until, args.group_by, args.metric, args.top)
+
+
+if __name__ == "__main__":
+    main()
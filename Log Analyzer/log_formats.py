@@ -0,0 +1,226 @@
+import re
+import json
+import time
+import argparse
+from datetime import date
+from functools import lru_cache
+from collections import namedtuple
+
+# One parsed log entry; status stays a string so reports keep their "200"/"404" keys
+LogRecord = namedtuple('LogRecord', ['ip', 'timestamp', 'method', 'path', 'status', 'size'])
+
+# The original single regex, kept so results can be compared against it
+LEGACY_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+).*?\[(.*?)\] "(.*?)" (\d+) (\d+)')
+
+# A quoted field in which Apache and nginx escape quotes as \"
+QUOTED = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+
+# %h %l %u %t "%r" %>s %b
+COMMON_PATTERN = re.compile(r'(\S+) \S+ \S+ \[([^\]]+)\] ' + QUOTED + r' (\d{3}) (\d+|-)')
+
+# %h %l %u %t "%r" %>s %b "%{Referer}i" "%{User-agent}i"
+COMBINED_PATTERN = re.compile(
+    r'(\S+) \S+ \S+ \[([^\]]+)\] ' + QUOTED + r' (\d{3}) (\d+|-) ' + QUOTED + ' ' + QUOTED)
+
+# nginx "combined": $remote_addr - $remote_user [$time_local] "$request" $status
+# $body_bytes_sent "$http_referer" "$http_user_agent" (quotes escaped as \x22 or \")
+NGINX_PATTERN = re.compile(
+    r'(\S+) - \S+ \[([^\]]+)\] "([^"\\]*(?:\\.[^"\\]*)*)" (\d{3}) (\d+) '
+    r'"[^"\\]*(?:\\.[^"\\]*)*" "[^"\\]*(?:\\.[^"\\]*)*"')
+
+MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+          'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=4096)
+def decode_time_prefix(prefix):
+    """Decode a timestamp prefix by fixed slices into (year, month, day, hour, minute), or None"""
+    try:
+        if prefix[2:3] == '/':
+            # "15/Aug/2025:08:15" from "15/Aug/2025:08:15:32 +0000"
+            year, month, day = int(prefix[7:11]), MONTHS[prefix[3:6]], int(prefix[0:2])
+            hour, minute = int(prefix[12:14]), int(prefix[15:17])
+        else:
+            # "2025-08-15T08:15" from ISO 8601 timestamps (JSON logs)
+            year, month, day = int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10])
+            hour, minute = int(prefix[11:13]), int(prefix[14:16])
+    except (KeyError, ValueError):
+        return None
+    if not (1 <= month <= 12 and 1 <= day <= 31 and hour < 24 and minute < 60):
+        return None
+    return (year, month, day, hour, minute)
+
+@lru_cache(maxsize=4096)
+def minute_seconds(prefix):
+    """Seconds since the epoch at the start of a timestamp's minute (the UTC offset is ignored)"""
+    parts = decode_time_prefix(prefix)
+    if parts is None:
+        return None
+    year, month, day, hour, minute = parts
+    try:
+        days = date(year, month, day).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+    return days * 86400 + hour * 3600 + minute * 60
+
+def timestamp_seconds(timestamp):
+    """Seconds since the epoch for a log timestamp, or None"""
+    base = minute_seconds(timestamp[:17])
+    if base is None:
+        return None
+    second = timestamp[18:20] if timestamp[2:3] == '/' else timestamp[17:19]
+    return base + int(second) if second.isdigit() else base
+
+def make_record(ip, timestamp, request, status, size):
+    """Build a LogRecord, splitting the request line into method and path"""
+    request_parts = request.split(None, 2)
+    if len(request_parts) >= 2:
+        method, path = request_parts[0], request_parts[1]
+    else:
+        method = path = None
+    return LogRecord(ip, timestamp, method, path, status, int(size) if size.isdigit() else 0)
+
+def split_record(line, combined=False):
+    """Fast path: build a LogRecord by splitting on quotes instead of running a regex"""
+    try:
+        head, request, tail = line.split('"', 2)
+    except ValueError:
+        return None
+    if request.endswith('\\'):
+        # An escaped quote inside the request: leave it to the regex
+        return None
+    fields = tail.split(None, 2)
+    if len(fields) < 2 or head[-2:] != '] ':
+        return None
+    status, size = fields[0], fields[1]
+    if len(status) != 3 or not status.isdigit():
+        return None
+    if combined and (len(fields) < 3 or fields[2][:1] != '"'):
+        return None
+    open_bracket = head.find(' [')
+    if open_bracket < 0:
+        return None
+    if size.isdigit():
+        size = int(size)
+    elif size == '-':
+        size = 0
+    else:
+        return None
+
+    request_parts = request.split(None, 2)
+    if len(request_parts) >= 2:
+        method, path = request_parts[0], request_parts[1]
+    else:
+        method = path = None
+    return LogRecord(head[:head.find(' ')], head[open_bracket + 2:-2], method, path, status, size)
+
+def parse_with_pattern(line, pattern):
+    """Parse a line with a precompiled regex whose first five groups are the core fields"""
+    match = pattern.match(line.strip())
+    if match:
+        return make_record(*match.groups()[:5])
+    return None
+
+def parse_legacy(line):
+    """Parse with the original lazy regex"""
+    return parse_with_pattern(line, LEGACY_PATTERN)
+
+def parse_common(line):
+    """Apache common format; fast split path with a regex fallback"""
+    return split_record(line) or parse_with_pattern(line, COMMON_PATTERN)
+
+def parse_combined(line):
+    """Apache combined format; fast split path with a regex fallback"""
+    return split_record(line, combined=True) or parse_with_pattern(line, COMBINED_PATTERN)
+
+def parse_nginx(line):
+    """nginx default (combined) format"""
+    return parse_with_pattern(line, NGINX_PATTERN)
+
+def parse_json(line):
+    """One JSON object per line, accepting the usual Apache/nginx field names"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    ip = entry.get('ip', entry.get('remote_addr'))
+    timestamp = entry.get('timestamp', entry.get('time_local', entry.get('time')))
+    status = entry.get('status')
+    if ip is None or timestamp is None or status is None:
+        return None
+    size = str(entry.get('size', entry.get('body_bytes_sent', entry.get('bytes', 0))))
+    if 'request' in entry:
+        return make_record(str(ip), str(timestamp), str(entry['request']), str(status), size)
+    return LogRecord(str(ip), str(timestamp), entry.get('method'), entry.get('path'),
+                     str(status), int(size) if size.isdigit() else 0)
+
+FORMATS = {
+    'legacy': parse_legacy,
+    'common': parse_common,
+    'combined': parse_combined,
+    'nginx': parse_nginx,
+    'json': parse_json,
+}
+
+def get_parser(name):
+    """Look up the line parser for a named log format"""
+    try:
+        return FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown log format: {name} (choose from {', '.join(sorted(FORMATS))})")
+
+
+def benchmark_formats(filename, names, repeat=3):
+    """Time each parser over the whole file and print lines/sec against the legacy regex"""
+    with open(filename, 'r', encoding='utf-8', errors='replace') as file:
+        lines = file.readlines()
+    if not lines:
+        print("❌ No lines to benchmark")
+        return {}
+
+    results = {}
+    for name in names:
+        parser = get_parser(name)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parsed = sum(1 for line in lines if parser(line))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (len(lines) / best if best else float('inf'), parsed)
+
+    if 'legacy' in names:
+        report_missed(lines, names)
+
+    baseline = results.get('legacy', (None,))[0]
+    print(f"\n⏱️  PARSER BENCHMARK ({len(lines)} lines, best of {repeat}):")
+    for name, (rate, parsed) in results.items():
+        speedup = f" ({rate / baseline:.2f}x legacy)" if baseline else ""
+        print(f"{name:>8}: {rate:12,.0f} lines/sec, {parsed} parsed{speedup}")
+    return results
+
+def report_missed(lines, names):
+    """Print, per format, how many lines the legacy regex parses but the format rejects"""
+    for name in names:
+        if name == 'legacy':
+            continue
+        parser = get_parser(name)
+        missed = [line for line in lines if parse_legacy(line) and not parser(line)]
+        if missed:
+            print(f"⚠️  {name}: {len(missed)} lines parsed by legacy are rejected, e.g. {missed[0].strip()}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the log format parsers')
+    parser.add_argument('logfile', help='Path to log file')
+    parser.add_argument('--formats', nargs='+', default=['legacy', 'common', 'combined', 'nginx'],
+                        choices=sorted(FORMATS), help='Formats to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per format')
+    args = parser.parse_args()
+    benchmark_formats(args.logfile, args.formats, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import json
+import random
+import argparse
+from itertools import accumulate
+from datetime import datetime, timedelta
+from log_input import OPENERS
+
+METHODS = ['GET', 'GET', 'GET', 'GET', 'GET', 'GET', 'POST', 'POST', 'PUT', 'DELETE', 'HEAD']
+STATUSES = ['200'] * 80 + ['304'] * 6 + ['301'] * 3 + ['404'] * 6 + ['401', '403', '500', '502', '503']
+SECTIONS = ['', 'api/', 'static/css/', 'static/js/', 'images/', 'blog/', 'products/', 'users/']
+AGENTS = ['Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+          'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15',
+          'curl/7.64.1', 'python-requests/2.25.1', 'Googlebot/2.1']
+REFERERS = ['-', 'https://google.com', 'https://mysite.com/index.html']
+
+# What an attacker burst probes for, and what the server answers
+ATTACK_PATHS = ['/wp-login.php', '/admin/login', '/.env', '/phpmyadmin/index.php', '/admin/config.php?id=1',
+                '/xmlrpc.php', '/wp-admin/setup.php', '/api/login']
+ATTACK_STATUSES = ['401', '401', '403', '404', '404', '200']
+ATTACK_AGENTS = ['sqlmap/1.3.11', 'Nikto/2.1.6', 'python-requests/2.25.1', 'Mozilla/5.0 (Windows NT 6.1; WOW64; rv:40.0)']
+
+MALFORMED = [
+    'garbage line without any structure',
+    '',
+    '10.0.0.1 - - [15/Aug/2025:08:15:32 +0000] "GET /truncated',
+    '- - - [-] "-" - -',
+    '10.0.0.1 - - [not a timestamp] "GET / HTTP/1.1" abc 12',
+]
+
+
+def zipf_weights(count, skew):
+    """Cumulative Zipf weights: the item of rank r is drawn in proportion to 1 / r**skew"""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+def format_line(ip, moment, method, path, status, size, referer, agent, log_format):
+    """One log line in Apache combined/common or JSON form"""
+    if log_format == 'json':
+        return json.dumps({'remote_addr': ip, 'time_local': moment.strftime('%d/%b/%Y:%H:%M:%S +0000'),
+                           'request': f"{method} {path} HTTP/1.1", 'status': int(status),
+                           'body_bytes_sent': size, 'http_user_agent': agent})
+    line = f'{ip} - - [{moment:%d/%b/%Y:%H:%M:%S} +0000] "{method} {path} HTTP/1.1" {status} {size}'
+    if log_format == 'combined':
+        line += f' "{referer}" "{agent}"'
+    return line
+
+def generate_lines(count, seed=42, log_format='combined', ips=10000, paths=5000, skew=1.1,
+                   attack_rate=0.0005, malformed_rate=0.001, start=datetime(2025, 8, 15),
+                   requests_per_second=50):
+    """Yield `count` reproducible log lines.
+
+    IPs and paths follow a Zipf distribution so a few keys dominate, as in real
+    traffic. Roughly `attack_rate` of the lines start an attack burst: one new IP
+    sends a few dozen requests to probe paths within seconds, mostly getting 4xx.
+    About `malformed_rate` of the lines are broken. The same seed always gives
+    the same file.
+    """
+    rng = random.Random(seed)
+    ip_pool = [f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+               for _ in range(ips)]
+    path_pool = [f"/{SECTIONS[rank % len(SECTIONS)]}page{rank}.html" if rank else '/'
+                 for rank in range(paths)]
+    ip_weights = zipf_weights(ips, skew)
+    path_weights = zipf_weights(paths, skew)
+    moment = start
+    burst = []
+    produced = 0
+    batch = 10000
+
+    while produced < count:
+        # Draw keys in batches; random.choices with cumulative weights is a bisect per draw
+        drawn = min(batch, count - produced)
+        batch_ips = rng.choices(ip_pool, cum_weights=ip_weights, k=drawn)
+        batch_paths = rng.choices(path_pool, cum_weights=path_weights, k=drawn)
+        for ip, path in zip(batch_ips, batch_paths):
+            moment += timedelta(seconds=rng.expovariate(requests_per_second))
+            roll = rng.random()
+            if burst:
+                attacker, probe, agent = burst.pop()
+                method = 'POST' if probe.endswith('login') else 'GET'
+                line = format_line(attacker, moment, method, probe, rng.choice(ATTACK_STATUSES),
+                                   rng.randint(100, 600), '-', agent, log_format)
+            elif roll < malformed_rate:
+                line = rng.choice(MALFORMED)
+            else:
+                if roll < malformed_rate + attack_rate:
+                    attacker = f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+                    agent = rng.choice(ATTACK_AGENTS)
+                    burst = [(attacker, rng.choice(ATTACK_PATHS), agent) for _ in range(rng.randint(20, 80))]
+                status = rng.choice(STATUSES)
+                size = 0 if status in ('304', '301') else int(rng.lognormvariate(8, 1.2))
+                line = format_line(ip, moment, rng.choice(METHODS), path, status, size,
+                                   rng.choice(REFERERS), rng.choice(AGENTS), log_format)
+            yield line
+        produced += drawn
+
+def write_log(filename, count, **options):
+    """Write generated lines to a file; .gz, .bz2 and .xz names are compressed"""
+    extension = filename.rsplit('.', 1)[-1]
+    opener = {'gz': OPENERS['gzip'], 'bz2': OPENERS['bz2'], 'xz': OPENERS['xz']}.get(extension, open)
+    with opener(filename, 'wt', encoding='utf-8') as file:
+        for line in generate_lines(count, **options):
+            file.write(line + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a reproducible synthetic access log')
+    parser.add_argument('output', help='File to write (.gz, .bz2 or .xz to compress)')
+    parser.add_argument('--lines', type=int, default=100000, help='Number of lines (default: 100000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--format', default='combined', choices=('common', 'combined', 'json'),
+                        help='Line format (default: combined)')
+    parser.add_argument('--ips', type=int, default=10000, help='Distinct client IPs (default: 10000)')
+    parser.add_argument('--paths', type=int, default=5000, help='Distinct paths (default: 5000)')
+    parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent for IPs and paths (default: 1.1)')
+    parser.add_argument('--attack-rate', type=float, default=0.0005,
+                        help='Chance per line of starting an attack burst (default: 0.0005)')
+    parser.add_argument('--malformed-rate', type=float, default=0.001,
+                        help='Fraction of malformed lines (default: 0.001)')
+    args = parser.parse_args()
+    write_log(args.output, args.lines, seed=args.seed, log_format=args.format, ips=args.ips,
+              paths=args.paths, skew=args.skew, attack_rate=args.attack_rate,
+              malformed_rate=args.malformed_rate)
+    print(f"📝 Wrote {args.lines:,} lines to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import bz2
+import glob
+import gzip
+import lzma
+import mmap
+import time
+import shutil
+import argparse
+import tempfile
+from itertools import chain
+
+# Large blocks keep the per-line work inside C: one decode and one split per block
+BLOCK_SIZE = 4 * 1024 * 1024
+
+MAGIC_BYTES = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+]
+
+OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+
+
+def detect_compression(filename):
+    """Return 'gzip', 'bz2' or 'xz' from the file's magic bytes, or None for plain text"""
+    with open(filename, 'rb') as file:
+        head = file.read(6)
+    for magic, name in MAGIC_BYTES:
+        if head.startswith(magic):
+            return name
+    return None
+
+def expand_paths(patterns):
+    """Expand glob patterns (for shells that do not), keeping the given order"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"⚠️  No files match {pattern}")
+        paths.extend(matches)
+    return paths
+
+def split_block(data):
+    """Decode a block of whole lines and split it into lines"""
+    lines = data.decode('utf-8', errors='replace').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+def read_plain_blocks(filename, start=0, end=None):
+    """Yield blocks of whole lines between two byte offsets of an uncompressed file through mmap"""
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if end <= start:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position < end:
+                block_end = min(position + BLOCK_SIZE, end)
+                if block_end < end:
+                    newline = mapped.rfind(b'\n', position, block_end)
+                    if newline < 0:
+                        # A single line longer than the block
+                        newline = mapped.find(b'\n', block_end, end)
+                    block_end = end if newline < 0 else newline + 1
+                yield mapped[position:block_end]
+                position = block_end
+
+def read_compressed_blocks(filename, compression, start=0, end=None):
+    """Yield blocks of whole lines of a compressed file, streamed through the decompressor in large blocks"""
+    with OPENERS[compression](filename, 'rb') as stream:
+        if start:
+            stream.seek(start)  # Offsets count decompressed bytes
+        position = start
+        pending = b''
+        while end is None or position < end:
+            block = stream.read(BLOCK_SIZE if end is None else min(BLOCK_SIZE, end - position))
+            if not block:
+                break
+            position += len(block)
+            data = pending + block
+            cut = data.rfind(b'\n') + 1
+            pending = data[cut:]
+            if cut:
+                yield data[:cut]
+        if pending:
+            yield pending
+
+def counted_blocks(blocks, profiler):
+    """Pass blocks through, counting their bytes (decompressed for archives) on the profiler"""
+    for block in blocks:
+        profiler.count(0, len(block), 0)
+        yield block
+
+def read_lines(filename, start=0, end=None, profiler=None):
+    """Iterate over the decoded lines of a plain or compressed log between two byte offsets"""
+    compression = detect_compression(filename)
+    if compression:
+        blocks = read_compressed_blocks(filename, compression, start, end)
+    else:
+        blocks = read_plain_blocks(filename, start, end)
+    if profiler is not None:
+        blocks = counted_blocks(blocks, profiler)
+    # chain keeps the per-line iteration in C
+    return chain.from_iterable(map(split_block, blocks))
+
+
+def benchmark_inputs(filename, repeat=3):
+    """Compare read throughput of text-mode open, mmap and each compressed format"""
+    size = os.path.getsize(filename)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        candidates = [('open() text', filename, None), ('mmap', filename, read_lines)]
+        for compression, opener in OPENERS.items():
+            path = os.path.join(directory, f"log.{compression}")
+            with open(filename, 'rb') as source, opener(path, 'wb') as target:
+                shutil.copyfileobj(source, target, BLOCK_SIZE)
+            candidates.append((compression, path, read_lines))
+
+        for name, path, reader in candidates:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                if reader is None:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                        count = sum(1 for _ in file)
+                else:
+                    count = sum(1 for _ in reader(path))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (count, best, os.path.getsize(path))
+
+    print(f"\n⏱️  INPUT BENCHMARK ({size / 1e6:.1f} MB uncompressed, best of {repeat}):")
+    for name, (count, elapsed, stored) in results.items():
+        print(f"{name:>12}: {size / 1e6 / elapsed:8.1f} MB/s, {count / elapsed:12,.0f} lines/sec "
+              f"({stored / 1e6:.1f} MB on disk)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark log input throughput per input type')
+    parser.add_argument('logfile', help='Plain-text log file to benchmark with')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per input type')
+    args = parser.parse_args()
+    benchmark_inputs(args.logfile, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
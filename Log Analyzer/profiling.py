@@ -0,0 +1,76 @@
+import sys
+import time
+from contextlib import contextmanager
+
+
+class RunProfiler:
+    """Wall and CPU time per stage plus line/byte throughput for one analyzer run.
+
+    Stages are timed around whole batches of lines, so profiling adds a few
+    clock reads per batch rather than per line. With progress set, a throughput
+    line is written to stderr at most every `progress` seconds.
+    """
+
+    def __init__(self, progress=None):
+        self.stages = {}  # name -> [wall seconds, cpu seconds]
+        self.merged = set()  # stages summed over worker processes, which overlap in time
+        self.lines = 0
+        self.bytes = 0
+        self.malformed = 0
+        self.progress = progress
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.next_progress = self.started + progress if progress else None
+
+    def add(self, name, wall, cpu):
+        times = self.stages.setdefault(name, [0.0, 0.0])
+        times[0] += wall
+        times[1] += cpu
+
+    @contextmanager
+    def stage(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def count(self, lines, size, malformed):
+        """Record a processed batch and print progress when it is due"""
+        self.lines += lines
+        self.bytes += size
+        self.malformed += malformed
+        if self.next_progress is not None:
+            now = time.perf_counter()
+            if now >= self.next_progress:
+                self.next_progress = now + self.progress
+                elapsed = now - self.started
+                print(f"⏳ {self.lines:,} lines, {self.lines / elapsed:,.0f} lines/sec, "
+                      f"{self.bytes / 1e6 / elapsed:.1f} MB/s", file=sys.stderr, flush=True)
+
+    def merge(self, other, prefix='workers: '):
+        """Add a worker's stage times (CPU time spent in parallel, not wall time) and counts"""
+        for name, (wall, cpu) in other.stages.items():
+            self.add(prefix + name, wall, cpu)
+            self.merged.add(prefix + name)
+        self.lines += other.lines
+        self.bytes += other.bytes
+        self.malformed += other.malformed
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        cpu = time.process_time() - self.started_cpu
+        print("\n⏱️  PROFILE:")
+        print(f"{'stage':<20} {'wall s':>9} {'cpu s':>9} {'wall %':>7}")
+        for name, (stage_wall, stage_cpu) in self.stages.items():
+            if name in self.merged:
+                # Seconds summed across processes can exceed the run's wall time, so no share
+                print(f"{name:<20} {stage_wall:9.3f} {stage_cpu:9.3f} {'-':>7}")
+                continue
+            share = stage_wall / elapsed * 100 if elapsed else 0
+            print(f"{name:<20} {stage_wall:9.3f} {stage_cpu:9.3f} {share:6.1f}%")
+        print(f"{'total':<20} {elapsed:9.3f} {cpu:9.3f}")
+        if elapsed:
+            print(f"Throughput: {self.lines / elapsed:,.0f} lines/sec, {self.bytes / 1e6 / elapsed:.1f} MB/s")
+        rate = self.malformed / self.lines * 100 if self.lines else 0
+        print(f"Malformed lines: {self.malformed:,} of {self.lines:,} ({rate:.2f}%)")
@@ -0,0 +1,176 @@
+from collections import deque
+from functools import lru_cache
+
+# The probes analyze_security_threats has always looked for
+DEFAULT_SIGNATURES = ['/admin', '/wp-admin', '/.env', '/phpmyadmin', '/config.php']
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: one pass over the text finds every signature in it"""
+
+    def __init__(self, signatures):
+        self.signatures = list(dict.fromkeys(signatures))  # drop duplicates, keep order
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [()]
+
+        for index, signature in enumerate(self.signatures):
+            state = 0
+            for char in signature:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(())
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.outputs[state] += (index,)
+
+        # Breadth-first so every fail target is finished before it is used
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self.goto[state].items():
+                queue.append(target)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(char, 0)
+                self.outputs[target] += self.outputs[self.fail[target]]
+
+        # Paths repeat a lot in access logs, so remember recent answers
+        self.match = lru_cache(maxsize=65536)(self._match)
+
+    def _match(self, text):
+        """Indices of every signature found in text, each reported once"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return tuple(sorted(found))
+
+    def __getstate__(self):
+        # The lru_cache wrapper cannot be pickled for worker processes
+        state = self.__dict__.copy()
+        del state['match']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.match = lru_cache(maxsize=65536)(self._match)
+
+
+def load_signatures(filename):
+    """Read one signature per line, skipping blank lines and # comments"""
+    signatures = []
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line in file:
+            signature = line.strip()
+            if signature and not signature.startswith('#'):
+                signatures.append(signature)
+    return signatures
+
+
+class IpWindow:
+    """Ring of per-slot counters for one IP"""
+    __slots__ = ('slot', 'requests', 'errors', 'unauthorized', 'totals')
+
+    def __init__(self, slot, slots):
+        self.slot = slot
+        self.requests = [0] * slots
+        self.errors = [0] * slots
+        self.unauthorized = [0] * slots
+        self.totals = [0, 0, 0]
+
+
+class SlidingWindowDetector:
+    """Per-IP request, 4xx and 401 rates over a sliding time window.
+
+    The window is split into `slots` ring buckets, so counts move forward one
+    slot at a time and memory per IP is fixed. Thresholds are checked as each
+    request arrives. IPs with nothing in the current window are evicted once
+    per window, keeping memory proportional to recently active IPs. A window
+    that is not a whole number of slots is rounded up to one, and `window`
+    holds the window actually covered.
+    """
+
+    KINDS = ('requests', '4xx', '401')
+
+    def __init__(self, window=60, slots=6, max_requests=60, max_errors=10, max_unauthorized=5):
+        self.slots = max(min(slots, window), 1)
+        self.slot_seconds = max(-(-window // self.slots), 1)
+        self.window = self.slot_seconds * self.slots
+        self.thresholds = (max_requests, max_errors, max_unauthorized)
+        self.ips = {}
+        self.alerts = {}  # ip -> {kind: [peak count, first seconds]}
+        self.last_sweep = None
+
+    def observe(self, ip, seconds, status):
+        slot = seconds // self.slot_seconds
+        if self.last_sweep is None:
+            self.last_sweep = slot
+        elif slot - self.last_sweep >= self.slots:
+            self.evict_idle(slot)
+
+        state = self.ips.get(ip)
+        if state is None:
+            state = self.ips[ip] = IpWindow(slot, self.slots)
+        elif slot > state.slot:
+            self._advance(state, slot)
+
+        index = state.slot % self.slots
+        error = status[:1] == '4'
+        unauthorized = status == '401'
+        state.requests[index] += 1
+        state.totals[0] += 1
+        if error:
+            state.errors[index] += 1
+            state.totals[1] += 1
+            if unauthorized:
+                state.unauthorized[index] += 1
+                state.totals[2] += 1
+
+        totals = state.totals
+        thresholds = self.thresholds
+        if totals[0] >= thresholds[0] or totals[1] >= thresholds[1] or totals[2] >= thresholds[2]:
+            self._record_alerts(ip, seconds, totals)
+
+    def _advance(self, state, slot):
+        """Clear the ring slots that fell out of the window"""
+        for step in range(state.slot + 1, min(slot, state.slot + self.slots) + 1):
+            index = step % self.slots
+            state.totals[0] -= state.requests[index]
+            state.totals[1] -= state.errors[index]
+            state.totals[2] -= state.unauthorized[index]
+            state.requests[index] = state.errors[index] = state.unauthorized[index] = 0
+        state.slot = slot
+
+    def _record_alerts(self, ip, seconds, totals):
+        alerts = self.alerts.setdefault(ip, {})
+        for kind, count, threshold in zip(self.KINDS, totals, self.thresholds):
+            if count >= threshold:
+                alert = alerts.get(kind)
+                if alert is None:
+                    alerts[kind] = [count, seconds]
+                elif count > alert[0]:
+                    alert[0] = count
+
+    def evict_idle(self, slot):
+        """Drop IPs whose whole window has expired"""
+        cutoff = slot - self.slots
+        self.ips = {ip: state for ip, state in self.ips.items() if state.slot > cutoff}
+        self.last_sweep = slot
+
+    def merge(self, other):
+        """Combine alerts from another detector (windows straddling chunks are judged per chunk)"""
+        for ip, alerts in other.alerts.items():
+            mine = self.alerts.setdefault(ip, {})
+            for kind, (peak, first) in alerts.items():
+                if kind not in mine:
+                    mine[kind] = [peak, first]
+                else:
+                    mine[kind] = [max(mine[kind][0], peak), min(mine[kind][1], first)]
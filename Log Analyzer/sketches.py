@@ -0,0 +1,217 @@
+import heapq
+from math import ceil, log
+from hashlib import blake2b
+from operator import itemgetter
+
+
+class SpaceSaving:
+    """Top-K heavy hitters in fixed memory (Metwally et al. Space-Saving).
+
+    Tracks at most `capacity` keys. With N items added, every reported count
+    overestimates the true count by at most its `error`, and error <= N / capacity.
+    Any key whose true count exceeds N / capacity is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []  # (count, key), one entry per tracked key, possibly stale
+
+    def add(self, key, count=1):
+        self.total += count
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            heapq.heappush(self._heap, (count, key))
+        else:
+            minimum = self._evict_minimum()
+            counts[key] = minimum + count
+            self.errors[key] = minimum
+            heapq.heappush(self._heap, (minimum + count, key))
+
+    def _evict_minimum(self):
+        """Remove the key with the smallest count and return that count"""
+        heap = self._heap
+        while True:
+            count, key = heap[0]
+            current = self.counts[key]
+            if current == count:
+                heapq.heappop(heap)
+                del self.counts[key]
+                del self.errors[key]
+                return count
+            # Count grew since it was pushed; refresh its position
+            heapq.heapreplace(heap, (current, key))
+
+    def merge(self, other):
+        """Fold another summary in; untracked keys are assumed to have each side's minimum"""
+        self_floor = min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+        other_floor = min(other.counts.values()) if len(other.counts) >= other.capacity else 0
+        merged = {}
+        for key in self.counts.keys() | other.counts.keys():
+            count = self.counts.get(key, self_floor) + other.counts.get(key, other_floor)
+            error = (self.errors.get(key, self_floor) + other.errors.get(key, other_floor))
+            merged[key] = (count, error)
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda item: item[1][0])
+        self.counts = {key: count for key, (count, _) in kept}
+        self.errors = {key: error for key, (_, error) in kept}
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def top(self, n):
+        """The n most frequent keys as (key, count) pairs, largest first"""
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+    def error_bound(self):
+        """Maximum overestimate of any reported count"""
+        return self.total // self.capacity
+
+    # Read-only mapping interface so report code can treat it like a dict
+    def __getitem__(self, key):
+        return self.counts[key]
+
+    def __iter__(self):
+        return iter(self.counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, key):
+        return key in self.counts
+
+    def items(self):
+        return self.counts.items()
+
+
+class HyperLogLog:
+    """Distinct-count estimate in 2**precision bytes.
+
+    Relative standard error is 1.04 / sqrt(2**precision): about 0.81% with the
+    default precision of 14 (16 KB of registers). Hashes are stable across
+    processes so sketches built by parallel workers can be merged.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, value):
+        hashed = int.from_bytes(blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self):
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return round(size * log(size / zeros))
+        return round(raw)
+
+    def relative_error(self):
+        return 1.04 / self.size ** 0.5
+
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin, Lang, Liberty) over numeric values.
+
+    Keeps O(k log(n/k)) values in a stack of compactors; when a level fills up
+    it is sorted and every other value is promoted with double weight. Rank
+    error is roughly 1.7 / k (about 1% with the default k=200). Compaction
+    alternates its offset instead of using randomness, so reports are repeatable.
+    """
+
+    def __init__(self, k=200):
+        self.k = k
+        self.compactors = []
+        self.offsets = []
+        self.size = 0
+        self.max_size = 0
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self._grow()
+
+    def _grow(self):
+        self.compactors.append([])
+        self.offsets.append(0)
+        self.max_size = sum(self._capacity(height) for height in range(len(self.compactors)))
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return int(ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def add(self, value):
+        self.compactors[0].append(value)
+        self.size += 1
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        if self.size >= self.max_size:
+            self._compress()
+
+    def _compress(self):
+        while self.size >= self.max_size:
+            for height, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(height):
+                    if height + 1 >= len(self.compactors):
+                        self._grow()
+                    compactor.sort()
+                    leftover = compactor.pop() if len(compactor) % 2 else None
+                    self.compactors[height + 1].extend(compactor[self.offsets[height]::2])
+                    self.offsets[height] ^= 1
+                    compactor.clear()
+                    if leftover is not None:
+                        compactor.append(leftover)
+                    break
+            self.size = sum(len(compactor) for compactor in self.compactors)
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+        self.count += other.count
+        if other.count:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        self._compress()
+
+    def quantiles(self, fractions):
+        """Approximate values at each fraction (0..1) of the distribution"""
+        if not self.count:
+            return [None for _ in fractions]
+        weighted = sorted((value, 1 << height)
+                          for height, compactor in enumerate(self.compactors) for value in compactor)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    results.append(value)
+                    break
+            else:
+                results.append(weighted[-1][0])
+        return results
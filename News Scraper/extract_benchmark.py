@@ -0,0 +1,125 @@
+import os
+import time
+import random
+import argparse
+from bs4 import BeautifulSoup
+from news_scraper import extract_headlines
+
+# Which selector a generated page is built to be won by
+PAGE_STYLES = ['h2.headline', 'h2', 'h3', 'h1', '.headline', 'none']
+WORDS = ['market', 'election', 'storm', 'climate', 'vote', 'court', 'league', 'record', 'talks', 'budget',
+		 'minister', 'energy', 'health', 'school', 'police', 'final', 'protest', 'rates', 'crisis', 'deal']
+
+
+def soup_headlines(html_content, limit=10):
+	"""The previous extraction: a full BeautifulSoup tree, then one find_all sweep per selector."""
+	soup = BeautifulSoup(html_content, 'html.parser')
+	selectors_to_try = [
+		('h2', {'class': 'headline'}),
+		('h2', {}),
+		('h3', {}),
+		('h1', {}),
+		('.headline', {}),
+	]
+	headlines = []
+	for tag, attrs in selectors_to_try:
+		found = soup.find_all(attrs={'class': tag[1:]}) if tag.startswith('.') else soup.find_all(tag, attrs)
+		if found:
+			headlines = found
+			break
+	texts = (headline.text.strip() for headline in headlines[:limit])
+	return [text for text in texts if text and len(text) > 10]
+
+def generate_page(seed, size, style):
+	"""A reproducible front page of about `size` bytes whose headlines only the `style` selector finds."""
+	rng = random.Random(seed)
+	title_tag, title_class = {'h2.headline': ('h2', 'headline'), 'h2': ('h2', 'title'), 'h3': ('h3', 'title'),
+							  'h1': ('h1', 'title'), '.headline': ('span', 'headline'), 'none': ('span', 'title')}[style]
+	parts = ['<!DOCTYPE html><html><head><title>Front page</title>',
+			 '<style>.story { margin: 0 } h2 > a { color: #222 }</style>',
+			 '<script>window.config = {"ads": true, "items": [1, 2, 3]};</script></head><body>',
+			 '<nav>' + ''.join(f'<a href="/s{i}">Section {i}</a>' for i in range(30)) + '</nav>']
+	length = sum(map(len, parts))
+	story = 0
+	while length < size:
+		words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+		title = f'<{title_tag} class="{title_class}"><a href="/story/{story}">Story {story}: {words} &amp; more</a></{title_tag}>'
+		body = ''.join(f'<p>{" ".join(rng.choice(WORDS) for _ in range(40))} &mdash; &#8220;quote&#8221;</p>'
+					   for _ in range(rng.randint(2, 6)))
+		extra = '<script>track({"story": %d});</script><img src="/i/%d.jpg" alt="photo">' % (story, story)
+		part = f'<article class="story">{title}{extra}{body}<br></article>'
+		parts.append(part)
+		length += len(part)
+		story += 1
+	parts.append('<footer><p>Footer</p></footer></body></html>')
+	return ''.join(parts)
+
+def load_pages(paths):
+	"""(name, HTML) of every .html file named or found in the given directories."""
+	pages = []
+	for path in paths:
+		files = sorted(os.path.join(path, name) for name in os.listdir(path)
+					   if name.endswith(('.html', '.htm'))) if os.path.isdir(path) else [path]
+		for filename in files:
+			with open(filename, 'r', encoding='utf-8', errors='replace') as file:
+				pages.append((os.path.basename(filename), file.read()))
+	return pages
+
+def best_time(function, repeat):
+	best = None
+	for _ in range(repeat):
+		started = time.perf_counter()
+		result = function()
+		elapsed = time.perf_counter() - started
+		best = elapsed if best is None else min(best, elapsed)
+	return result, best
+
+def run_benchmark(pages, limit=10, repeat=3):
+	"""Time both extractions on every page and check they give the same headlines; returns the mismatches."""
+	print(f"⏱️  EXTRACTION BENCHMARK (limit {limit}, best of {repeat}):")
+	mismatches = []
+	total_old = total_new = 0
+	for name, html_content in pages:
+		expected, old = best_time(lambda: soup_headlines(html_content, limit), repeat)
+		found, new = best_time(lambda: extract_headlines(html_content, limit, quiet=True), repeat)
+		total_old += old
+		total_new += new
+		same = found == expected
+		if not same:
+			mismatches.append(name)
+		print(f"{'✅' if same else '❌'} {name:<28} {len(html_content) / 1e6:5.2f} MB: soup {old * 1000:8.1f} ms, "
+			  f"single pass {new * 1000:7.1f} ms ({old / new:5.1f}x), {len(found)} headlines")
+	if pages:
+		print(f"Total: {total_old:.2f}s -> {total_new:.2f}s ({total_old / total_new:.1f}x faster)")
+	if mismatches:
+		print(f"❌ Different headlines on {len(mismatches)} pages: {', '.join(mismatches)}")
+	return mismatches
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark single-pass headline extraction against BeautifulSoup')
+	parser.add_argument('pages', nargs='*', help='Saved .html pages, or directories of them')
+	parser.add_argument('--generate', type=int, default=0,
+						help='Also benchmark this many generated pages, one per selector style in turn')
+	parser.add_argument('--size', type=float, default=2, help='Size of generated pages in MB (default: 2)')
+	parser.add_argument('--save', help='Write the generated pages to this directory, to reuse as fixtures')
+	parser.add_argument('--limit', '-l', type=int, default=10, help='Headlines per page (default: 10)')
+	parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per page (default: 3)')
+	args = parser.parse_args()
+
+	pages = load_pages(args.pages)
+	for number in range(args.generate):
+		style = PAGE_STYLES[number % len(PAGE_STYLES)]
+		name = f"generated_{number}_{style.strip('.').replace('.', '_')}.html"
+		pages.append((name, generate_page(number, int(args.size * 1e6), style)))
+		if args.save:
+			os.makedirs(args.save, exist_ok=True)
+			with open(os.path.join(args.save, name), 'w', encoding='utf-8') as file:
+				file.write(pages[-1][1])
+	if not pages:
+		parser.error('give saved pages or --generate')
+	run_benchmark(pages, args.limit, args.repeat)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,213 @@
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Tried in this order; the first selector that matches any element wins.
+# (name shown to the user, tag or None for any tag, required class or None)
+HEADLINE_SELECTORS = [
+	('h2', 'h2', 'headline'),
+	('h2', 'h2', None),  # All h2 tags
+	('h3', 'h3', None),  # All h3 tags
+	('h1', 'h1', None),  # All h1 tags
+	('.headline', None, 'headline'),  # Any element with class 'headline'
+]
+
+# Elements that never have content, so they are closed as soon as they open
+VOID_ELEMENTS = frozenset([
+	'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+	'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+	'nextid', 'spacer',
+])
+# Text inside these is not part of the page text (script code, ruby annotations, template contents)
+HIDDEN_TEXT_ELEMENTS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+# Outside these, a string of nothing but whitespace is shortened to one newline or space
+PRESERVE_WHITESPACE_ELEMENTS = frozenset(['pre', 'textarea'])
+SPACES = ' \n\t\x0c\r'
+ENTITIES = {name.rstrip(';'): character for name, character in html5.items()}
+NUMERIC_REFERENCE = re.compile('^([0-9]+)(.*)')
+HEX_REFERENCE = re.compile('^([0-9a-f]+)(.*)')
+
+
+def numeric_character(number):
+	"""The character of a numeric reference by the HTML5 rules: 0x80-0x9F are read as windows-1252."""
+	if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+		return '\ufffd'
+	if 0x80 <= number <= 0x9F:
+		try:
+			return bytes([number]).decode('cp1252')
+		except UnicodeDecodeError:
+			pass
+	return chr(number)
+
+
+class Done(Exception):
+	"""Raised to stop parsing once the rest of the page cannot change the result."""
+
+
+class HeadlineParser(HTMLParser):
+	"""Finds the elements matching HEADLINE_SELECTORS in one pass over the HTML.
+
+	The text of an element is only collected for the first `limit` matches of
+	each selector, and once a selector has matched, worse selectors are no
+	longer checked. Elements nest exactly as in BeautifulSoup's html.parser
+	tree (an end tag closes everything opened after its start tag, and stray
+	end tags are ignored) so the same elements and text are found.
+	"""
+
+	def __init__(self, limit=None):
+		super().__init__(convert_charrefs=False)
+		self.limit = limit
+		self.candidates = len(HEADLINE_SELECTORS)  # selectors still able to win
+		self.counts = [0] * len(HEADLINE_SELECTORS)
+		self.matches = [[] for _ in HEADLINE_SELECTORS]  # text chunks of each match, in page order
+		self.stack = []  # (tag, text chunks or None) for every open element
+		self.collecting = []  # text chunks of the open matching elements
+		self.hidden = []  # open HIDDEN_TEXT_ELEMENTS
+		self.preserving = 0  # open PRESERVE_WHITESPACE_ELEMENTS
+		self.text = []  # pieces of the string being read, up to the next tag
+		self.void_end_tags = {}  # name: void elements opened as <tag>, whose first </tag> is ignored
+		self.stopped = False
+
+	def handle_starttag(self, tag, attrs):
+		self.start(tag, attrs)
+		if tag in VOID_ELEMENTS:
+			self.void_end_tags[tag] = self.void_end_tags.get(tag, 0) + 1
+			self.finish()
+
+	def handle_startendtag(self, tag, attrs):
+		self.start(tag, attrs)
+		if tag in VOID_ELEMENTS:
+			self.finish()
+		else:
+			self.handle_endtag(tag, explicit=False)
+
+	def start(self, tag, attrs):
+		self.end_string()
+		chunks = None
+		classes = None
+		for index in range(self.candidates):
+			_, wanted_tag, wanted_class = HEADLINE_SELECTORS[index]
+			if wanted_tag is not None and wanted_tag != tag:
+				continue
+			if wanted_class is not None:
+				if classes is None:
+					# A repeated attribute replaces the earlier one
+					classes = (dict(attrs).get('class') or '').split()
+				if wanted_class not in classes:
+					continue
+			# Worse selectors can no longer win, so stop checking them
+			self.candidates = index + 1
+			self.counts[index] += 1
+			if self.limit is None or self.counts[index] <= self.limit:
+				chunks = [tag if tag in HIDDEN_TEXT_ELEMENTS else None]
+				self.matches[index].append(chunks)
+			break
+
+		if tag in VOID_ELEMENTS:
+			return
+		self.stack.append((tag, chunks))
+		if chunks is not None:
+			self.collecting.append(chunks)
+		if tag in HIDDEN_TEXT_ELEMENTS:
+			self.hidden.append(tag)
+		if tag in PRESERVE_WHITESPACE_ELEMENTS:
+			self.preserving += 1
+
+	def handle_endtag(self, tag, explicit=True):
+		if explicit and self.void_end_tags.get(tag):
+			# Already closed when it opened; this end tag does not even end the current string
+			self.void_end_tags[tag] -= 1
+			return
+		self.end_string()
+		for position in range(len(self.stack) - 1, -1, -1):
+			if self.stack[position][0] == tag:
+				break
+		else:
+			return
+		for name, chunks in reversed(self.stack[position:]):
+			if chunks is not None:
+				self.collecting.pop()
+			if name in HIDDEN_TEXT_ELEMENTS:
+				self.hidden.pop()
+			if name in PRESERVE_WHITESPACE_ELEMENTS:
+				self.preserving -= 1
+		del self.stack[position:]
+		self.finish()
+
+	def finish(self):
+		"""Stop once the best selector has `limit` matches whose text is complete."""
+		if self.limit is not None and self.counts[0] >= self.limit and not self.collecting:
+			self.stopped = True
+			raise Done
+
+	def handle_data(self, data):
+		self.text.append(data)
+
+	def end_string(self, main_text=False):
+		"""Hand the string read since the last tag to the open matching elements."""
+		if not self.text:
+			return
+		data = ''.join(self.text)
+		self.text = []
+		if not self.preserving and not data.strip(SPACES):
+			data = '\n' if '\n' in data else ' '
+		# A string belongs to the innermost open hidden-text element, if any; an element
+		# only takes the strings of its own kind (a normal element: those outside any)
+		kind = self.hidden[-1] if self.hidden and not main_text else None
+		for chunks in self.collecting:
+			if chunks[0] == kind:
+				chunks.append(data)
+
+	def handle_comment(self, data):
+		self.end_string()
+
+	def handle_decl(self, decl):
+		self.end_string()
+
+	def handle_pi(self, data):
+		self.end_string()
+
+	def handle_entityref(self, name):
+		self.handle_data(ENTITIES.get(name, '&' + name))
+
+	def handle_charref(self, name):
+		base, pattern = 10, NUMERIC_REFERENCE
+		if name[:1] in ('x', 'X'):
+			name, base, pattern = name[1:], 16, HEX_REFERENCE
+		try:
+			number, rest = int(name, base), ''
+		except ValueError:
+			# Digits followed by other text: the digits are the reference, the rest is text
+			match = pattern.match(name)
+			if match is None:
+				self.handle_data(name)
+				return
+			number, rest = int(match.group(1), base), match.group(2)
+		self.handle_data(numeric_character(number) + rest)
+
+	def unknown_decl(self, data):
+		# CDATA sections are strings of their own, and count as text even inside hidden-text elements
+		self.end_string()
+		if data.upper().startswith('CDATA['):
+			self.text.append(data[len('CDATA['):])
+			self.end_string(main_text=True)
+
+
+def find_headlines(html_content, limit=None):
+	"""Parse a page; returns (winning selector index or None, its match count, the match texts, stopped early).
+
+	Only the first `limit` texts are returned. When parsing stopped early the
+	match count is a lower bound.
+	"""
+	parser = HeadlineParser(limit)
+	try:
+		parser.feed(html_content)
+		parser.close()
+		parser.end_string()
+	except Done:
+		pass
+	for index, count in enumerate(parser.counts[:parser.candidates]):
+		if count:
+			texts = [''.join(chunks[1:]) for chunks in parser.matches[index]]
+			return index, count, texts, parser.stopped
+	return None, 0, [], parser.stopped
@@ -0,0 +1,96 @@
+import os
+import csv
+import sqlite3
+import hashlib
+import unicodedata
+
+HISTORY_SUFFIX = '.history.db'
+LOOKUP_BATCH = 500  # keys per query, well under SQLite's limit on query parameters
+
+
+def normalize(text):
+	"""Headline text as compared for duplicates: NFKC, case-folded, with whitespace collapsed."""
+	return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def headline_key(headline, source_name):
+	"""16-byte hash identifying a headline of a source."""
+	return hashlib.blake2b(f"{source_name}\0{normalize(headline)}".encode('utf-8'), digest_size=16).digest()
+
+
+def csv_rows(filename):
+	"""(headline, source) of every row in a CSV written by the scraper."""
+	with open(filename, 'r', newline='', encoding='utf-8') as file:
+		for row in csv.DictReader(file):
+			if row.get('Headline') is not None and row.get('Source') is not None:
+				yield row['Headline'], row['Source']
+
+
+class HeadlineStore:
+	"""The headlines saved in one CSV file, per source, as a SQLite index of hashes.
+
+	The hash is the table's primary key in a WITHOUT ROWID table, so checking
+	a headline is one lookup in a B-tree of 16-byte keys. The table stays a
+	few levels deep even with millions of headlines. The index also records
+	which CSV it describes and that file's size after the last write; if the
+	CSV is missing, another file, or was changed since (rotated, edited), the
+	index is rebuilt from the rows the CSV holds now.
+	"""
+
+	def __init__(self, csv_filename, path=None):
+		self.csv_filename = os.path.abspath(csv_filename)
+		self.connection = sqlite3.connect(path or csv_filename + HISTORY_SUFFIX, timeout=30)
+		self.connection.execute('CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID')
+		self.connection.execute('CREATE TABLE IF NOT EXISTS indexed (csv TEXT, size INTEGER)')
+		self.rebuilt = self.sync()
+
+	def csv_size(self):
+		try:
+			return os.path.getsize(self.csv_filename)
+		except OSError:
+			return None
+
+	def sync(self):
+		"""Rebuild the index unless it describes the CSV as it is now; returns the rows indexed, or None."""
+		size = self.csv_size()
+		if self.connection.execute('SELECT csv, size FROM indexed').fetchone() == (self.csv_filename, size):
+			return None
+		rows = list(csv_rows(self.csv_filename)) if size else []
+		with self.connection:
+			self.connection.execute('DELETE FROM seen')
+			self.insert(rows)
+			self.record_size(size)
+		return len(rows)
+
+	def insert(self, rows):
+		self.connection.executemany('INSERT OR IGNORE INTO seen VALUES (?)',
+									((headline_key(headline, source_name),) for headline, source_name in rows))
+
+	def record_size(self, size):
+		self.connection.execute('DELETE FROM indexed')
+		self.connection.execute('INSERT INTO indexed VALUES (?, ?)', (self.csv_filename, size))
+
+	def unseen(self, rows):
+		"""The (headline, source) rows not saved before, in order and without repeats."""
+		keys = [headline_key(headline, source_name) for headline, source_name in rows]
+		seen = set()
+		unique = list(dict.fromkeys(keys))
+		for start in range(0, len(unique), LOOKUP_BATCH):
+			batch = unique[start:start + LOOKUP_BATCH]
+			query = f"SELECT key FROM seen WHERE key IN ({','.join('?' * len(batch))})"
+			seen.update(key for key, in self.connection.execute(query, batch))
+		new_rows = []
+		for key, row in zip(keys, rows):
+			if key not in seen:
+				seen.add(key)
+				new_rows.append(row)
+		return new_rows
+
+	def remember(self, rows):
+		"""Record (headline, source) rows just appended to the CSV, with its new size, in one transaction."""
+		with self.connection:
+			self.insert(rows)
+			self.record_size(self.csv_size())
+
+	def close(self):
+		self.connection.close()
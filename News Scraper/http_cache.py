@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+INDEX = 'index.json'
+DEFAULT_MAX_MB = 200
+DEFAULT_MAX_DAYS = 7
+
+
+class ResponseCache:
+	"""Page bodies kept on disk with their ETag/Last-Modified, for conditional GETs.
+
+	Each entry also keeps the headlines parsed from its body, so a 304 answer
+	needs neither a download nor a parse. When the cache is saved, entries not
+	used for max_days are dropped, then the least recently used ones until
+	the bodies fit in max_mb. Safe to use from several threads.
+	"""
+
+	def __init__(self, directory, max_mb=DEFAULT_MAX_MB, max_days=DEFAULT_MAX_DAYS):
+		self.directory = directory
+		self.max_bytes = max_mb * 1024 * 1024
+		self.max_age = max_days * 24 * 3600
+		self.lock = threading.Lock()
+		self.hits = self.misses = self.bytes_saved = self.bytes_downloaded = 0
+		try:
+			with open(os.path.join(directory, INDEX), 'r', encoding='utf-8') as file:
+				self.entries = json.load(file)
+		except (OSError, ValueError):
+			self.entries = {}
+
+	def body_path(self, url):
+		return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html')
+
+	def conditional_headers(self, url):
+		"""If-None-Match/If-Modified-Since headers for a cached URL, or {} if it is not cached."""
+		with self.lock:
+			entry = self.entries.get(url)
+		headers = {}
+		if entry and entry['etag']:
+			headers['If-None-Match'] = entry['etag']
+		if entry and entry['last_modified']:
+			headers['If-Modified-Since'] = entry['last_modified']
+		return headers
+
+	def not_modified(self, url):
+		"""The cached body after a 304 answer, counted as a hit; None if the entry has gone."""
+		try:
+			with open(self.body_path(url), 'r', encoding='utf-8') as file:
+				body = file.read()
+		except OSError:
+			return None
+		with self.lock:
+			entry = self.entries.get(url)
+			if not entry:
+				return None
+			entry['used'] = time.time()
+			self.hits += 1
+			self.bytes_saved += entry['size']
+		return body
+
+	def store(self, url, headers, body):
+		"""Keep a downloaded body if the server sent a validator for it; counted as a miss either way."""
+		data = body.encode('utf-8')
+		etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+		with self.lock:
+			self.misses += 1
+			self.bytes_downloaded += len(data)
+			self.entries.pop(url, None)
+		if not (etag or last_modified):
+			return
+		os.makedirs(self.directory, exist_ok=True)
+		path = self.body_path(url)
+		temporary = f"{path}.{threading.get_ident()}.tmp"
+		with open(temporary, 'wb') as file:
+			file.write(data)
+		os.replace(temporary, path)
+		with self.lock:
+			self.entries[url] = {'etag': etag, 'last_modified': last_modified, 'size': len(data),
+								 'used': time.time(), 'headlines': {}}
+
+	def headlines(self, url, limit):
+		"""Headlines parsed earlier from the cached body with the same limit, or None."""
+		with self.lock:
+			entry = self.entries.get(url)
+			return entry['headlines'].get(str(limit)) if entry else None
+
+	def store_headlines(self, url, limit, headlines):
+		with self.lock:
+			if url in self.entries:
+				self.entries[url]['headlines'][str(limit)] = headlines
+
+	def evict(self):
+		"""Drop entries unused for max_age, then the least recently used until the rest fit in max_bytes."""
+		now = time.time()
+		kept, total, full = {}, 0, False
+		# Most recently used first: once one entry is too old or does not fit, every older one goes too
+		for url, entry in sorted(self.entries.items(), key=lambda item: item[1]['used'], reverse=True):
+			full = full or now - entry['used'] > self.max_age or total + entry['size'] > self.max_bytes
+			if not full:
+				kept[url] = entry
+				total += entry['size']
+				continue
+			try:
+				os.remove(self.body_path(url))
+			except OSError:
+				pass
+		evicted = len(self.entries) - len(kept)
+		self.entries = kept
+		return evicted
+
+	def save(self):
+		"""Evict, then write the index atomically."""
+		with self.lock:
+			evicted = self.evict()
+			if not self.entries and not os.path.isdir(self.directory):
+				return evicted
+			os.makedirs(self.directory, exist_ok=True)
+			filename = os.path.join(self.directory, INDEX)
+			with open(filename + '.tmp', 'w', encoding='utf-8') as file:
+				json.dump(self.entries, file)
+			os.replace(filename + '.tmp', filename)
+		return evicted
+
+	def report(self, evicted=0):
+		print(f"🗄️  Cache: {self.hits} hits (304 not modified), {self.misses} misses; "
+			  f"{self.bytes_saved / 1e6:.2f} MB not downloaded again, {self.bytes_downloaded / 1e6:.2f} MB downloaded"
+			  + (f"; {evicted} old pages evicted" if evicted else ""))
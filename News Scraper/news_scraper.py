@@ -1,97 +1,172 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
+import asyncio
 import csv
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
+from urllib.parse import urlparse
+from http_cache import ResponseCache, DEFAULT_MAX_MB, DEFAULT_MAX_DAYS
+from headline_parser import HEADLINE_SELECTORS, find_headlines
+from headline_store import HeadlineStore, HISTORY_SUFFIX
+
+NEWS_SOURCES = {
+	'bbc': 'https://www.bbc.com/news',
+	'cnn': 'https://www.cnn.com',
+	'bbc-sport': 'https://www.bbc.com/sport',
+	'reuters': 'https://www.reuters.com',
+	'guardian': 'https://www.theguardian.com/uk'
+}
+DEFAULT_TIMEOUT = 15  # seconds to connect, and between bytes of the response
+DEFAULT_RETRIES = 2
+DEFAULT_CONCURRENCY = 20
+CSV_BUFFER = 1024 * 1024  # bytes buffered before a write, so a whole run is appended in a few writes
 
 
 def get_news_url(source):
 	"""Get the URL for predefined news sources."""
-	urls = {
-		'bbc': 'https://www.bbc.com/news',
-		'cnn': 'https://www.cnn.com',
-		'bbc-sport': 'https://www.bbc.com/sport',
-		'reuters': 'https://www.reuters.com',
-		'guardian': 'https://www.theguardian.com/uk'
-	}
-	return urls.get(source.lower())
-
-
-def save_to_csv(headlines, filename, source_name):
-	"""Save headlines to a CSV file."""
+	return NEWS_SOURCES.get(source.lower())
+
+
+def source_name_for(url):
+	"""Short source name for a custom URL: its domain without 'www.'."""
 	try:
-		with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+		return urlparse(url).netloc.replace('www.', '') or 'custom_url'
+	except ValueError:
+		return 'custom_url'
+
+
+def save_to_csv(headlines, filename, source_name, dedup=False, history=None):
+	"""Append headlines to a CSV file."""
+	return save_rows_to_csv([(headline, source_name) for headline in headlines], filename, dedup, history)
+
+
+def save_rows_to_csv(rows, filename, dedup=False, history=None):
+	"""Append (headline, source) rows to a CSV file; with dedup, only those not already in it.
+	
+	The file's headlines are indexed in `history` (default: <filename>.history.db).
+	"""
+	store = None
+	try:
+		found = len(rows)
+		if dedup:
+			store = HeadlineStore(filename, history)
+			if store.rebuilt:
+				print(f"🔁 '{filename}' changed since the last run; rebuilt its history ({store.rebuilt} headlines)")
+			rows = store.unseen(rows)
+			if not rows:
+				print(f"💤 No new headlines: all {found} were saved before, '{filename}' is unchanged")
+				return True
+		
+		with open(filename, 'a', newline='', encoding='utf-8', buffering=CSV_BUFFER) as csvfile:
 			writer = csv.writer(csvfile)
 			
-			# Write header
-			writer.writerow(['Number', 'Headline', 'Source', 'Date_Scraped'])
+			# Write header if the file is new
+			if csvfile.tell() == 0:
+				writer.writerow(['Number', 'Headline', 'Source', 'Date_Scraped'])
 			
-			# Write headlines
+			# Write headlines, numbered within this run
 			current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-			for i, headline in enumerate(headlines, 1):
-				writer.writerow([i, headline, source_name, current_time])
+			writer.writerows([i, headline, source_name, current_time]
+							 for i, (headline, source_name) in enumerate(rows, 1))
 		
-		print(f"💾 Successfully saved {len(headlines)} headlines to '{filename}'")
+		# Only remembered once written, so a failed write is retried on the next run
+		if store:
+			store.remember(rows)
+		skipped = found - len(rows)
+		print(f"💾 Successfully saved {len(rows)} {'new ' if store else ''}headlines to '{filename}'"
+			  + (f" ({skipped} saved before were skipped)" if skipped else ""))
 		return True
 		
 	except Exception as e:
 		print(f"❌ Error saving to CSV: {e}")
 		return False
+	finally:
+		if store:
+			store.close()
+
+
+def make_session(pool_size=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+	"""A requests Session with keep-alive connection pools that retries failed connections and 429/5xx."""
+	session = requests.Session()
+	retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+				  allowed_methods=('GET', 'HEAD'), raise_on_status=False)
+	adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+	session.mount('http://', adapter)
+	session.mount('https://', adapter)
+	return session
+
+
+def fetch_page(session, url, timeout=DEFAULT_TIMEOUT, cache=None):
+	"""Download a page; returns (status code, HTML text, whether the text came from the cache).
+	
+	With a cache the request is conditional, and a 304 answer is served from the cache.
+	"""
+	headers = cache.conditional_headers(url) if cache else {}
+	response = session.get(url, timeout=timeout, headers=headers)
+	if cache and response.status_code == 304:
+		body = cache.not_modified(url)
+		if body is not None:
+			return 200, body, True
+		# The cached copy has gone, so ask again for the whole page
+		response = session.get(url, timeout=timeout)
+	if cache and response.status_code == 200:
+		cache.store(url, response.headers, response.text)
+	return response.status_code, response.text, False
 
 
-def scrape_headlines(url, limit=10):
+def page_headlines(html_content, url, limit, cache, cached, quiet=False):
+	"""Headlines of a page, reusing those parsed before when the page came unchanged from the cache."""
+	headlines = cache.headlines(url, limit) if cached else None
+	if headlines is None:
+		headlines = extract_headlines(html_content, limit, quiet)
+		if cache:
+			cache.store_headlines(url, limit, headlines)
+	elif not quiet:
+		print(f"♻️  Reusing {len(headlines)} headlines parsed on an earlier run")
+	return headlines
+
+
+def extract_headlines(html_content, limit=10, quiet=False):
+	"""Find headlines in a page using the first selector that matches anything."""
+	# One pass over the page tries every selector (see headline_parser.HEADLINE_SELECTORS)
+	# and stops early once nothing later in the page can change the result
+	index, count, found, stopped = find_headlines(html_content, limit if limit >= 0 else None)
+	
+	if index is None:
+		if not quiet:
+			print("❌ No headlines found with any selector")
+		return []
+	if not quiet:
+		print(f"🔍 Found {count}{'+' if stopped else ''} headlines using selector: {HEADLINE_SELECTORS[index][0]}")
+	
+	# Extract text and limit results
+	headline_texts = []
+	for text in found[:limit]:
+		text = text.strip()
+		if text and len(text) > 10:  # Filter out empty or very short text
+			headline_texts.append(text)
+	
+	return headline_texts
+
+
+def scrape_headlines(url, limit=10, session=None, timeout=DEFAULT_TIMEOUT, cache=None):
 	"""Scrape headlines from a given URL."""
 	print(f"🔍 Scraping headlines from: {url}")
 	
 	try:
-		response = requests.get(url)
-		print(f"✅ Got response: {response.status_code}")
+		status, html_content, cached = fetch_page(session or make_session(), url, timeout, cache)
+		print("✅ Not modified since the last run (304), using the cached page" if cached
+			  else f"✅ Got response: {status}")
 		
-		if response.status_code != 200:
-			print(f"❌ Error: Website returned status {response.status_code}")
+		if status != 200:
+			print(f"❌ Error: Website returned status {status}")
 			return []
 		
-		html_content = response.text
 		print(f"📄 HTML length: {len(html_content)} characters")
-
-		soup = BeautifulSoup(html_content, 'html.parser')
-		print("🍲 Created soup object")
-		
-		# Try different selectors to find headlines
-		selectors_to_try = [
-			('h2', {'class': 'headline'}),
-			('h2', {}),  # All h2 tags
-			('h3', {}),  # All h3 tags
-			('h1', {}),  # All h1 tags
-			('.headline', {}),  # Any element with class 'headline'
-		]
-		
-		headlines = []
-		for tag, attrs in selectors_to_try:
-			if tag.startswith('.'):
-				# CSS class selector
-				found = soup.find_all(attrs={'class': tag[1:]})
-			else:
-				# HTML tag selector
-				found = soup.find_all(tag, attrs)
-			
-			if found:
-				print(f"🔍 Found {len(found)} headlines using selector: {tag}")
-				headlines = found
-				break
-		
-		if not headlines:
-			print("❌ No headlines found with any selector")
-			return []
-		
-		# Extract text and limit results
-		headline_texts = []
-		for headline in headlines[:limit]:
-			text = headline.text.strip()
-			if text and len(text) > 10:  # Filter out empty or very short text
-				headline_texts.append(text)
-		
-		return headline_texts
+		return page_headlines(html_content, url, limit, cache, cached)
 		
 	except requests.RequestException as e:
 		print(f"❌ Network error: {e}")
@@ -101,6 +176,94 @@ def scrape_headlines(url, limit=10):
 		return []
 
 
+async def scrape_many(targets, limit=10, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+					  retries=DEFAULT_RETRIES, workers=None, cache=None):
+	"""Scrape (source name, url) targets concurrently; returns a result dict per target, in order.
+	
+	At most `concurrency` downloads run at once, on threads sharing one pooled
+	Session, so connections to a host are kept alive and reused. Pages are
+	parsed in a process pool so parsing never holds up the downloads;
+	pages the cache says are unchanged are not parsed again at all.
+	"""
+	loop = asyncio.get_running_loop()
+	session = make_session(concurrency, retries)
+	limiter = asyncio.Semaphore(concurrency)
+	
+	with ThreadPoolExecutor(concurrency) as fetchers, ProcessPoolExecutor(workers) as parsers:
+		async def scrape(source_name, url):
+			result = {'source': source_name, 'url': url, 'status': None, 'headlines': [], 'error': None}
+			try:
+				async with limiter:
+					result['status'], html_content, cached = await loop.run_in_executor(
+						fetchers, fetch_page, session, url, timeout, cache)
+				if result['status'] != 200:
+					result['error'] = f"status {result['status']}"
+				else:
+					headlines = cache.headlines(url, limit) if cached else None
+					if headlines is None:
+						headlines = await loop.run_in_executor(
+							parsers, extract_headlines, html_content, limit, True)
+						if cache:
+							cache.store_headlines(url, limit, headlines)
+					result['headlines'] = headlines
+			except requests.RequestException as e:
+				result['error'] = f"network error: {e}"
+			except Exception as e:
+				result['error'] = str(e)
+			return result
+		
+		try:
+			return await asyncio.gather(*(scrape(source_name, url) for source_name, url in targets))
+		finally:
+			session.close()
+
+
+def read_url_file(filename):
+	"""URLs from a file, one per line; blank lines and lines starting with # are skipped."""
+	with open(filename, 'r', encoding='utf-8') as file:
+		return [line.strip() for line in file if line.strip() and not line.lstrip().startswith('#')]
+
+
+def collect_targets(args):
+	"""(source name, url) pairs from --source, --url and --url-file, in that order, without duplicates."""
+	targets = []
+	for source in args.source or []:
+		names = list(NEWS_SOURCES) if source == 'all' else [source]
+		targets.extend((name, get_news_url(name)) for name in names)
+	urls = list(args.url or [])
+	if args.url_file:
+		urls.extend(read_url_file(args.url_file))
+	targets.extend((source_name_for(url), url) for url in urls)
+	
+	seen = set()
+	return [(name, url) for name, url in targets if not (url in seen or seen.add(url))]
+
+
+def run_many(targets, args, cache=None):
+	"""Scrape many sites at once and print each site's headlines and a summary."""
+	print(f"🌐 Scraping {len(targets)} sites, up to {args.concurrency} at a time...")
+	started = time.perf_counter()
+	results = asyncio.run(scrape_many(targets, args.limit, args.concurrency, args.timeout, args.retries,
+									  args.workers, cache))
+	elapsed = time.perf_counter() - started
+	
+	rows = []
+	for result in results:
+		if result['error']:
+			print(f"\n❌ {result['source']} ({result['url']}): {result['error']}")
+			continue
+		print(f"\n📰 {result['source']}: {len(result['headlines'])} headlines")
+		for i, headline in enumerate(result['headlines'], 1):
+			print(f"{i:2d}. {headline}")
+		rows.extend((headline, result['source']) for headline in result['headlines'])
+	
+	succeeded = sum(1 for result in results if not result['error'])
+	print("=" * 60)
+	print(f"⏱️  Scraped {succeeded} of {len(results)} sites in {elapsed:.1f}s "
+		  f"({len(results) / elapsed:.1f} sites/sec), {len(rows)} headlines")
+	return rows
+
+
 def main():
 	# Create argument parser
 	parser = argparse.ArgumentParser(
@@ -112,16 +275,19 @@ Examples:
   python3 news_scraper.py --url https://www.cnn.com --limit 10 --csv
   python3 news_scraper.py --source bbc-sport --output sports_news.csv
   python3 news_scraper.py --url https://news.ycombinator.com --limit 20 -o tech_news
+  python3 news_scraper.py --source all --url-file sites.txt --concurrency 50 --csv
+  python3 news_scraper.py --source all --output news.csv   # hourly: only new headlines are appended
 		"""
 	)
 	
-	# Add arguments
-	group = parser.add_mutually_exclusive_group(required=True)
-	group.add_argument('--source', '-s', 
-					  choices=['bbc', 'cnn', 'bbc-sport', 'reuters', 'guardian'],
-					  help='Predefined news source')
-	group.add_argument('--url', '-u',
-					  help='Custom URL to scrape headlines from')
+	# Add arguments (repeat --source and --url, or combine them, to scrape many sites at once)
+	parser.add_argument('--source', '-s', action='append',
+						choices=list(NEWS_SOURCES) + ['all'],
+						help='Predefined news source, or all of them')
+	parser.add_argument('--url', '-u', action='append',
+						help='Custom URL to scrape headlines from')
+	parser.add_argument('--url-file',
+						help='File with one URL to scrape per line')
 	
 	parser.add_argument('--limit', '-l', 
 					   type=int, 
@@ -135,30 +301,71 @@ Examples:
 					   action='store_true',
 					   help='Save to CSV with auto-generated filename')
 	
+	parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+						help=f'Most downloads at once when scraping several sites (default: {DEFAULT_CONCURRENCY})')
+	parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+						help=f'Seconds to wait for a site to connect or send data (default: {DEFAULT_TIMEOUT})')
+	parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+						help=f'Retries after connection errors and 429/5xx responses (default: {DEFAULT_RETRIES})')
+	parser.add_argument('--workers', type=int,
+						help='Processes parsing pages when scraping several sites (default: CPU count)')
+	parser.add_argument('--cache-dir', default='.scraper_cache',
+						help='Where pages are cached for conditional requests (default: .scraper_cache)')
+	parser.add_argument('--no-cache', action='store_true',
+						help='Always download pages in full, without reading or writing the cache')
+	parser.add_argument('--cache-size', type=float, default=DEFAULT_MAX_MB,
+						help=f'Most megabytes of cached pages kept (default: {DEFAULT_MAX_MB})')
+	parser.add_argument('--cache-days', type=float, default=DEFAULT_MAX_DAYS,
+						help=f'Drop cached pages not used for this many days (default: {DEFAULT_MAX_DAYS})')
+	parser.add_argument('--history',
+						help=f'Index of the headlines already in the CSV, so it only gets new ones (default: <csv>{HISTORY_SUFFIX})')
+	parser.add_argument('--no-dedup', action='store_true',
+						help='Save every headline found, even ones saved before, without recording them')
+	
 	# Parse arguments
 	args = parser.parse_args()
 	
+	try:
+		targets = collect_targets(args)
+	except OSError as e:
+		print(f"❌ Could not read URL file: {e}")
+		return
+	if not targets:
+		parser.error('give at least one --source, --url or --url-file')
+	
+	cache = None if args.no_cache else ResponseCache(args.cache_dir, args.cache_size, args.cache_days)
+	try:
+		scrape_targets(targets, args, cache)
+	finally:
+		if cache:
+			try:
+				cache.report(cache.save())
+			except OSError as e:
+				print(f"⚠️  Could not save the cache: {e}")
+
+
+def scrape_targets(targets, args, cache=None):
+	"""Scrape one target verbosely, or several concurrently, then print and save the new headlines."""
+	if len(targets) > 1:
+		rows = run_many(targets, args, cache)
+		if rows and (args.output or args.csv):
+			if args.output:
+				filename = args.output if args.output.endswith('.csv') else args.output + '.csv'
+			else:
+				filename = f"headlines_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+			save_rows_to_csv(rows, filename, not args.no_dedup, args.history)
+		return
+	
 	# Determine URL to use
+	source_name, url = targets[0]
 	if args.source:
-		url = get_news_url(args.source)
-		if not url:
-			print(f"❌ Unknown source: {args.source}")
-			return
-		print(f"📰 Using predefined source: {args.source}")
-		source_name = args.source
+		print(f"📰 Using predefined source: {source_name}")
 	else:
-		url = args.url
 		print(f"🌐 Using custom URL: {url}")
-		# Extract domain name for source
-		try:
-			from urllib.parse import urlparse
-			domain = urlparse(url).netloc
-			source_name = domain.replace('www.', '')
-		except:
-			source_name = 'custom_url'
 	
 	# Scrape headlines
-	headlines = scrape_headlines(url, args.limit)
+	headlines = scrape_headlines(url, args.limit, timeout=args.timeout,
+								 session=make_session(1, args.retries), cache=cache)
 	
 	# Display results
 	if headlines:
@@ -180,7 +387,7 @@ Examples:
 				timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 				filename = f"headlines_{source_name}_{timestamp}.csv"
 			
-			success = save_to_csv(headlines, filename, source_name)
+			success = save_to_csv(headlines, filename, source_name, not args.no_dedup, args.history)
 			if success:
 				print(f"📄 You can open '{filename}' in Excel or any spreadsheet app!")
 	else: